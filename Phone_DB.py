@@ -1,57 +1,324 @@
 import sqlite3
 import re
+from datetime import date, datetime, timedelta
 
-def create_database(db_path):
-    """Создает или подключается к базе данных SQLite и создает таблицы contacts и phone_numbers."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS contacts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                last_name TEXT,
-                first_name TEXT,
-                middle_name TEXT,
-                email TEXT,
-                dob TEXT
-            )
-        """)
+# Текущая версия схемы базы данных, хранится в PRAGMA user_version
+SCHEMA_VERSION = 4
 
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS phone_numbers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contact_id INTEGER,
-                phone_number TEXT,
-                FOREIGN KEY (contact_id) REFERENCES contacts(id)
-            )
-        """)
-    except sqlite3.OperationalError as e:
+def create_database(db_path, **connect_options):
+    """
+    Создает или подключается к базе данных SQLite и доводит ее схему до текущей версии
+    (таблицы contacts и phone_numbers, индексы, полнотекстовый индекс поиска).
+    connect_options передаются в sqlite3.connect (например, check_same_thread=False).
+    """
+    conn = sqlite3.connect(db_path, **connect_options)
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        migrate_database(conn)
+    except sqlite3.DatabaseError as e:
         print(f"Ошибка при создании базы данных: {e}")
         conn.close()
         return None
-    conn.commit()
     return conn
 
-def load_contacts(conn):
-    """Загружает контакты и связанные с ними номера телефонов из базы данных SQLite."""
+def migrate_database(conn):
+    """
+    Применяет к базе недостающие миграции схемы по номеру версии из PRAGMA user_version.
+    Каждая миграция выполняется в отдельной транзакции вместе с записью новой версии.
+    """
+    cursor = conn.cursor()
+    version = cursor.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        raise sqlite3.DatabaseError(f"схема версии {version} новее поддерживаемой ({SCHEMA_VERSION})")
+    for target_version, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        try:
+            cursor.execute("BEGIN")
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {target_version}")
+            conn.commit()
+        except sqlite3.DatabaseError:
+            conn.rollback()
+            raise
+
+def _migrate_v1(cursor):
+    """
+    Версия 1: исходная схема. Для баз, созданных до появления версий, только дополняет
+    недостающее - нормализованные номера телефонов и полнотекстовый индекс.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            last_name TEXT,
+            first_name TEXT,
+            middle_name TEXT,
+            email TEXT,
+            dob TEXT
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS phone_numbers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contact_id INTEGER,
+            phone_number TEXT,
+            FOREIGN KEY (contact_id) REFERENCES contacts(id)
+        )
+    """)
+    _add_normalized_phones(cursor)
+    _create_search_index(cursor)
+
+def _migrate_v2(cursor):
+    """
+    Версия 2: phone_numbers пересоздается с UNIQUE(contact_id, phone_normalized) и каскадным
+    удалением вместе с контактом; добавляется индекс по ФИО. Повторяющиеся номера одного
+    контакта и номера удаленных контактов при переносе отбрасываются.
+    """
+    cursor.execute("""
+        CREATE TABLE phone_numbers_v2 (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            contact_id INTEGER NOT NULL REFERENCES contacts(id) ON DELETE CASCADE,
+            phone_number TEXT,
+            phone_normalized TEXT,
+            phone_reversed TEXT,
+            UNIQUE (contact_id, phone_normalized)
+        )
+    """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO phone_numbers_v2 (id, contact_id, phone_number, phone_normalized, phone_reversed)
+        SELECT id, contact_id, phone_number, phone_normalized, phone_reversed
+        FROM phone_numbers
+        WHERE contact_id IN (SELECT id FROM contacts)
+        ORDER BY id
+    """)
+    cursor.execute("DROP TABLE phone_numbers")
+    cursor.execute("ALTER TABLE phone_numbers_v2 RENAME TO phone_numbers")
+    # Индекс UNIQUE начинается с contact_id и обслуживает выборку номеров контакта и каскадное удаление
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_phone_numbers_reversed ON phone_numbers (phone_reversed)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts (last_name, first_name, middle_name)")
+    if _has_table(cursor, 'contacts_fts'):
+        _create_phone_search_triggers(cursor)
+        cursor.execute("""
+            UPDATE contacts_fts
+            SET phones = COALESCE((SELECT group_concat(phone_number, ',') FROM phone_numbers WHERE contact_id = contacts_fts.rowid), '')
+        """)
+
+# Дата рождения хранится как dd.mm.yyyy; выражения ниже строят из нее сортируемые ISO-строки
+_DOB_IS_VALID = "dob GLOB '[0-9][0-9].[0-9][0-9].[0-9][0-9][0-9][0-9]'"
+
+def _migrate_v3(cursor):
+    """
+    Версия 3: вычисляемые колонки dob_iso (yyyy-mm-dd) и dob_md (mm-dd) из dob с индексами -
+    для выборки по диапазону дат рождения и ближайших дней рождения без полного перебора.
+    Для пустой даты или даты не в формате dd.mm.yyyy обе колонки равны NULL.
+    Колонки виртуальные, поэтому отдельно заполнять их не нужно - значения попадают в индексы при их создании.
+    """
+    cursor.execute(f"""
+        ALTER TABLE contacts ADD COLUMN dob_iso TEXT GENERATED ALWAYS AS (
+            CASE WHEN {_DOB_IS_VALID} THEN substr(dob, 7, 4) || '-' || substr(dob, 4, 2) || '-' || substr(dob, 1, 2) END
+        ) VIRTUAL
+    """)
+    cursor.execute(f"""
+        ALTER TABLE contacts ADD COLUMN dob_md TEXT GENERATED ALWAYS AS (
+            CASE WHEN {_DOB_IS_VALID} THEN substr(dob, 4, 2) || '-' || substr(dob, 1, 2) END
+        ) VIRTUAL
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_dob_iso ON contacts (dob_iso)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_dob_md ON contacts (dob_md)")
+
+def _migrate_v4(cursor):
+    """
+    Версия 4: фамилия, имя и отчество не бывают NULL - пустые значения хранятся как ''.
+    Иначе сравнение строк (фамилия, имя, отчество, id) с NULL дает NULL и такие контакты
+    выпадают из постраничной загрузки. Существующие NULL заменяются, а триггеры заменяют их
+    при любой записи, в том числе в обход функций модуля.
+    """
+    cursor.execute("""
+        UPDATE contacts
+        SET last_name = COALESCE(last_name, ''), first_name = COALESCE(first_name, ''), middle_name = COALESCE(middle_name, '')
+        WHERE last_name IS NULL OR first_name IS NULL OR middle_name IS NULL
+    """)
+    for event in ("INSERT", "UPDATE OF last_name, first_name, middle_name"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS contacts_name_not_null_{event.split()[0].lower()} AFTER {event} ON contacts
+            WHEN NEW.last_name IS NULL OR NEW.first_name IS NULL OR NEW.middle_name IS NULL
+            BEGIN
+                UPDATE contacts
+                SET last_name = COALESCE(NEW.last_name, ''), first_name = COALESCE(NEW.first_name, ''), middle_name = COALESCE(NEW.middle_name, '')
+                WHERE id = NEW.id;
+            END
+        """)
+
+# Миграции схемы по порядку: MIGRATIONS[i] переводит базу из версии i в версию i + 1
+MIGRATIONS = [_migrate_v1, _migrate_v2, _migrate_v3, _migrate_v4]
+
+def _add_normalized_phones(cursor):
+    """
+    Добавляет в phone_numbers колонки с нормализованным номером (только цифры) и цифрами
+    в обратном порядке, заполняет их для существующих записей и создает индекс
+    для поиска по точному номеру и по его последним цифрам.
+    """
+    cursor.execute("PRAGMA table_info(phone_numbers)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if 'phone_normalized' not in columns:
+        cursor.execute("ALTER TABLE phone_numbers ADD COLUMN phone_normalized TEXT")
+        cursor.execute("ALTER TABLE phone_numbers ADD COLUMN phone_reversed TEXT")
+        # Триггер индекса поиска пересоздается в _create_search_index, без него заполнение не пересчитывает contacts_fts
+        cursor.execute("DROP TRIGGER IF EXISTS phone_numbers_fts_update")
+        last_id = 0
+        while True:
+            cursor.execute("SELECT id, phone_number FROM phone_numbers WHERE id > ? ORDER BY id LIMIT 10000", (last_id,))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            cursor.executemany(
+                "UPDATE phone_numbers SET phone_normalized = ?, phone_reversed = ? WHERE id = ?",
+                [(normalize_phone_number(phone), normalize_phone_number(phone)[::-1], phone_id) for phone_id, phone in rows]
+            )
+            last_id = rows[-1][0]
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_phone_numbers_reversed ON phone_numbers (phone_reversed)")
+
+def _create_search_index(cursor):
+    """
+    Создает полнотекстовый индекс contacts_fts (FTS5, токенизатор trigram) по ФИО, email,
+    дате рождения и номерам телефонов, триггеры для его синхронизации и заполняет его для
+    существующей базы. Если SQLite собран без FTS5, индекс не создается и поиск идет через LIKE.
+    """
+    if not _has_table(cursor, 'contacts_fts'):
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE contacts_fts USING fts5(
+                    last_name, first_name, middle_name, email, dob, phones,
+                    tokenize = 'trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return
+        # Заполняем индекс для уже существующих контактов
+        cursor.execute("""
+            INSERT INTO contacts_fts (rowid, last_name, first_name, middle_name, email, dob, phones)
+            SELECT c.id, c.last_name, c.first_name, c.middle_name, c.email, c.dob, COALESCE(group_concat(pn.phone_number, ','), '')
+            FROM contacts c
+            LEFT JOIN phone_numbers pn ON c.id = pn.contact_id
+            GROUP BY c.id
+        """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_insert AFTER INSERT ON contacts BEGIN
+            INSERT INTO contacts_fts (rowid, last_name, first_name, middle_name, email, dob, phones)
+            VALUES (NEW.id, NEW.last_name, NEW.first_name, NEW.middle_name, NEW.email, NEW.dob, '');
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_update AFTER UPDATE ON contacts BEGIN
+            UPDATE contacts_fts
+            SET last_name = NEW.last_name, first_name = NEW.first_name, middle_name = NEW.middle_name,
+                email = NEW.email, dob = NEW.dob
+            WHERE rowid = NEW.id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS contacts_fts_delete AFTER DELETE ON contacts BEGIN
+            DELETE FROM contacts_fts WHERE rowid = OLD.id;
+        END
+    """)
+    _create_phone_search_triggers(cursor)
+
+def _create_phone_search_triggers(cursor):
+    """Создает триггеры, поддерживающие колонку phones в contacts_fts при изменении phone_numbers."""
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS phone_numbers_fts_insert AFTER INSERT ON phone_numbers BEGIN
+            UPDATE contacts_fts
+            SET phones = CASE WHEN phones = '' THEN NEW.phone_number ELSE phones || ',' || NEW.phone_number END
+            WHERE rowid = NEW.contact_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS phone_numbers_fts_delete AFTER DELETE ON phone_numbers BEGIN
+            UPDATE contacts_fts
+            SET phones = COALESCE((SELECT group_concat(phone_number, ',') FROM phone_numbers WHERE contact_id = OLD.contact_id), '')
+            WHERE rowid = OLD.contact_id;
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS phone_numbers_fts_update AFTER UPDATE OF contact_id, phone_number ON phone_numbers BEGIN
+            UPDATE contacts_fts
+            SET phones = COALESCE((SELECT group_concat(phone_number, ',') FROM phone_numbers WHERE contact_id = contacts_fts.rowid), '')
+            WHERE rowid IN (OLD.contact_id, NEW.contact_id);
+        END
+    """)
+
+def _has_table(cursor, name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+    return cursor.fetchone() is not None
+
+def has_search_index(conn):
+    """Проверяет, есть ли в базе полнотекстовый индекс contacts_fts."""
+    return _has_table(conn.cursor(), 'contacts_fts')
+
+def _contact_from_row(row):
+    """Собирает словарь контакта из строки (id, last_name, first_name, middle_name, email, dob, телефоны через запятую)."""
+    contact_id, last_name, first_name, middle_name, email, dob, phone_numbers = row
+    phones = [phone.strip() for phone in phone_numbers.split(',')] if phone_numbers else []
+    return {'id': contact_id, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': phones}
+
+# Число контактов на одной странице при постраничной загрузке и выводе
+PAGE_SIZE = 50
+
+def load_contacts_page(conn, after=None, page_size=PAGE_SIZE):
+    """
+    Загружает одну страницу контактов, упорядоченных по (фамилия, имя, отчество, id),
+    начиная после ключа after. Возвращает список контактов и ключ для следующей страницы
+    (None, если страница последняя).
+    """
     cursor = conn.cursor()
+    query = "SELECT id, last_name, first_name, middle_name, email, dob FROM contacts"
+    params = ()
+    if after is not None:
+        query += " WHERE (last_name, first_name, middle_name, id) > (?, ?, ?, ?)"
+        params = tuple(after)
+    query += " ORDER BY last_name, first_name, middle_name, id LIMIT ?"
     try:
-        cursor.execute("SELECT c.last_name, c.first_name, c.middle_name, c.email, c.dob, group_concat(pn.phone_number, ',') FROM contacts c LEFT JOIN phone_numbers pn ON c.id = pn.contact_id GROUP BY c.id")
+        cursor.execute(query, params + (page_size,))
+        rows = cursor.fetchall()
+        if not rows:
+            return [], None
+        contacts = {contact_id: {'id': contact_id, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': []}
+                    for contact_id, last_name, first_name, middle_name, email, dob in rows}
+        cursor.execute(f"SELECT contact_id, phone_number FROM phone_numbers WHERE contact_id IN ({', '.join('?' * len(contacts))}) ORDER BY id", tuple(contacts))
     except sqlite3.OperationalError as e:
         print(f"Ошибка при загрузке контактов: {e}")
-        return []
-    contacts = []
-    for last_name, first_name, middle_name, email, dob, phone_numbers in cursor.fetchall():
-        name = ' '.join((last_name, first_name, middle_name)).strip()
-        phones = [phone.strip() for phone in phone_numbers.split(',')] if phone_numbers else []
-        contacts.append({'name': name, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': phones})
-    return contacts
+        return [], None
+    for contact_id, phone_number in cursor:
+        contacts[contact_id]['phones'].append(phone_number)
+    contact_id, last_name, first_name, middle_name = rows[-1][:4]
+    next_key = (last_name, first_name, middle_name, contact_id) if len(rows) == page_size else None
+    return list(contacts.values()), next_key
+
+def iter_contacts(conn, page_size=PAGE_SIZE):
+    """Постранично перебирает все контакты, держа в памяти не больше одной страницы."""
+    after = None
+    while True:
+        contacts, after = load_contacts_page(conn, after, page_size)
+        yield from contacts
+        if after is None:
+            return
+
+def load_contacts(conn):
+    """Загружает все контакты и связанные с ними номера телефонов из базы данных SQLite списком."""
+    return list(iter_contacts(conn))
 
 def validate_phone_number(phone_number):
     """Проверяет правильность формата номера телефона."""
     pattern = r'^\+?[\d\s\-\(\)]+$'
     return bool(re.match(pattern, phone_number))
 
+def normalize_phone_number(phone_number):
+    """Приводит номер телефона к нормализованному виду - только цифры: "+7 (999) 123-45-67" -> "79991234567"."""
+    return re.sub(r'\D', '', phone_number)
+
+def _phone_row(contact_id, phone_number):
+    """Строка для вставки в phone_numbers: номер в исходном, нормализованном и обращенном виде."""
+    normalized = normalize_phone_number(phone_number)
+    return contact_id, phone_number, normalized, normalized[::-1]
+
 def validate_email(email):
     """Проверяет правильность формата email."""
     pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
@@ -62,236 +329,564 @@ def validate_date(date):
     pattern = r'^\d{2}\.\d{2}\.\d{4}$'
     return bool(re.match(pattern, date))
 
-def save_contact(conn, last_name, first_name, middle_name, phones, email=None, dob=None):
-    """Сохраняет контакт и связанные с ним номера телефонов в базе данных SQLite."""
-    name = ' '.join((last_name, first_name, middle_name)).strip()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id FROM contacts WHERE last_name = ? AND first_name = ? AND middle_name = ?", (last_name, first_name, middle_name))
-    existing_contact = cursor.fetchone()
-
-    # Проверка номеров телефонов
-    valid_phones = [phone for phone in phones if validate_phone_number(phone)]
-    if not valid_phones:
-        print("Некорректный формат номера телефона. Контакт не сохранен.")
-        return
+def validate_contact(phones, email=None, dob=None):
+    """
+    Проверяет поля контакта по тем же правилам, что и при ручном вводе.
+    Возвращает текст ошибки или None, если контакт можно сохранять.
+    """
+    # Проверка номеров телефонов (None - номера не меняются)
+    if phones is not None and not any(validate_phone_number(phone) for phone in phones):
+        return "Некорректный формат номера телефона."
 
     # Проверка email (если указан)
     if email and not validate_email(email):
-        print("Некорректный формат email. Контакт не сохранен.")
-        return
+        return "Некорректный формат email."
 
     # Проверка даты рождения (если указана)
     if dob and not validate_date(dob):
-        print("Некорректный формат даты рождения. Контакт не сохранен.")
+        return "Некорректный формат даты рождения."
+    return None
+
+def save_contact(conn, last_name, first_name, middle_name, phones, email=None, dob=None, cache=None):
+    """
+    Сохраняет контакт и связанные с ним номера телефонов в базе данных SQLite.
+    Возвращает id контакта или None, если контакт не сохранен. Если передан cache (ContactCache),
+    сохраненный контакт обновляется в нем на месте.
+    """
+    name = ' '.join((last_name, first_name, middle_name)).strip()
+    cursor = conn.cursor()
+    cursor.execute("SELECT id FROM contacts WHERE last_name = ? AND first_name = ? AND middle_name = ?", (last_name, first_name, middle_name))
+    existing_contact = cursor.fetchone()
+
+    error = validate_contact(phones, email, dob)
+    if error:
+        print(f"{error} Контакт не сохранен.")
         return
+    phones = _unique_phones(phones)
 
     if existing_contact:
         contact_id = existing_contact[0]
-        new_phones = [phone for phone in valid_phones if phone not in get_phone_numbers(conn, contact_id)]
-        for phone in new_phones:
-            cursor.execute("INSERT INTO phone_numbers (contact_id, phone_number) VALUES (?, ?)", (contact_id, phone))
+        # Уже сохраненные номера отсекает UNIQUE(contact_id, phone_normalized)
+        cursor.executemany("INSERT OR IGNORE INTO phone_numbers (contact_id, phone_number, phone_normalized, phone_reversed) VALUES (?, ?, ?, ?)", [_phone_row(contact_id, phone) for phone in phones])
         conn.commit()
+        if cache is not None:
+            cache.add_phones(contact_id, phones)
         print(f"Новые номера телефонов добавлены к существующему контакту '{name}'.")
     else:
         cursor.execute("INSERT INTO contacts (last_name, first_name, middle_name, email, dob) VALUES (?, ?, ?, ?, ?)", (last_name, first_name, middle_name, email, dob))
         contact_id = cursor.lastrowid
-        for phone in valid_phones:
-            cursor.execute("INSERT INTO phone_numbers (contact_id, phone_number) VALUES (?, ?)", (contact_id, phone))
+        cursor.executemany("INSERT INTO phone_numbers (contact_id, phone_number, phone_normalized, phone_reversed) VALUES (?, ?, ?, ?)", [_phone_row(contact_id, phone) for phone in phones])
         conn.commit()
+        if cache is not None:
+            cache.put({'id': contact_id, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': phones})
         print("Контакт добавлен.")
+    return contact_id
+
+def _unique_phones(phones):
+    """Оставляет корректные номера телефонов без повторов (сравнение по нормализованному виду)."""
+    unique = {}
+    for phone in phones:
+        if validate_phone_number(phone):
+            unique.setdefault(normalize_phone_number(phone), phone)
+    return list(unique.values())
 
-def edit_contact(conn, identifier, new_last_name=None, new_first_name=None, new_middle_name=None, new_phones=None, new_email=None, new_dob=None):
+def add_contacts(conn, contacts):
     """
-    Редактирует контакт с заданным именем, фамилией, отчеством, номером телефона, email или датой рождения,
-    заменяя его новыми данными.
+    Добавляет пачку новых контактов одной транзакцией через executemany.
+    contacts - последовательность кортежей (last_name, first_name, middle_name, phones, email, dob),
+    заранее проверенных validate_contact. Слияние с существующими контактами не выполняется.
+    Возвращает список id добавленных контактов.
     """
+    contacts = list(contacts)
+    if not contacts:
+        return []
     cursor = conn.cursor()
-    update_query = "UPDATE contacts SET "
-    update_values = []
-    if new_last_name:
-        update_query += "last_name = ?, "
-        update_values.append(new_last_name)
-    if new_first_name:
-        update_query += "first_name = ?, "
-        update_values.append(new_first_name)
-    if new_middle_name:
-        update_query += "middle_name = ?, "
-        update_values.append(new_middle_name)
-    if new_email is not None:
-        update_query += "email = ?, "
-        update_values.append(new_email)
-    if new_dob is not None:
-        update_query += "dob = ?, "
-        update_values.append(new_dob)
-    update_query = update_query.rstrip(", ") + " WHERE last_name = ? OR first_name = ? OR middle_name = ? OR email = ? OR dob = ?"
-    update_values.extend([identifier] * 5)
-    try:
-        cursor.execute(update_query, update_values)
-    except sqlite3.OperationalError as e:
-        print(f"Ошибка при редактировании контакта: {e}")
-        return
-    if cursor.rowcount > 0:
-        conn.commit()
-        contact_id = cursor.lastrowid
-        if new_phones:
-            cursor.execute("DELETE FROM phone_numbers WHERE contact_id = ?", (contact_id,))
-            valid_phones = [phone for phone in new_phones if validate_phone_number(phone)]
-            for phone in valid_phones:
-                cursor.execute("INSERT INTO phone_numbers (contact_id, phone_number) VALUES (?, ?)", (contact_id, phone))
-        conn.commit()
-        print("Контакт отредактирован.")
-        # Обновляем контакты после редактирования
-        contacts = load_contacts(conn)
-    else:
-        print("Контакт не найден.")
+    with conn:
+        # Резервируем диапазон id заранее, чтобы связать номера телефонов без запроса на каждую строку
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute("""
+            SELECT MAX(COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'contacts'), 0),
+                       COALESCE((SELECT MAX(id) FROM contacts), 0))
+        """)
+        first_id = cursor.fetchone()[0] + 1
+        contact_ids = list(range(first_id, first_id + len(contacts)))
+        # Построчные триггеры индекса поиска переписывали бы строку contacts_fts на каждый номер телефона.
+        # На время пачки они снимаются (в той же транзакции, поэтому другие соединения этого не видят),
+        # а строки индекса строятся после вставки одним запросом сразу со всеми номерами
+        search_triggers = _drop_triggers(cursor, ('contacts_fts_insert', 'phone_numbers_fts_insert'))
+        cursor.executemany(
+            "INSERT INTO contacts (id, last_name, first_name, middle_name, email, dob) VALUES (?, ?, ?, ?, ?, ?)",
+            [(contact_id, last_name, first_name, middle_name, email, dob)
+             for contact_id, (last_name, first_name, middle_name, phones, email, dob) in zip(contact_ids, contacts)]
+        )
+        cursor.executemany(
+            "INSERT INTO phone_numbers (contact_id, phone_number, phone_normalized, phone_reversed) VALUES (?, ?, ?, ?)",
+            [_phone_row(contact_id, phone)
+             for contact_id, contact in zip(contact_ids, contacts)
+             for phone in _unique_phones(contact[3])]
+        )
+        if search_triggers:
+            cursor.execute("""
+                INSERT INTO contacts_fts (rowid, last_name, first_name, middle_name, email, dob, phones)
+                SELECT c.id, c.last_name, c.first_name, c.middle_name, c.email, c.dob,
+                       COALESCE((SELECT group_concat(phone_number, ',') FROM (SELECT phone_number FROM phone_numbers WHERE contact_id = c.id ORDER BY id)), '')
+                FROM contacts c
+                WHERE c.id >= ?
+            """, (first_id,))
+            for sql in search_triggers:
+                cursor.execute(sql)
+    return contact_ids
+
+def _drop_triggers(cursor, names):
+    """Удаляет существующие триггеры из names и возвращает их определения, чтобы потом создать их заново."""
+    cursor.execute(f"SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name IN ({', '.join('?' * len(names))})", names)
+    definitions = [row[0] for row in cursor.fetchall()]
+    for name in names:
+        cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+    return definitions
+
+def save_contacts(conn, contacts):
+    """
+    Пакетный вариант save_contact: сохраняет пачку контактов одной транзакцией. Контакт с теми же ФИО,
+    что у существующего или у предыдущего в пачке, не дублируется - его номера добавляются к тому
+    контакту, остальные поля не меняются. contacts - кортежи как у add_contacts, заранее проверенные
+    validate_contact. Возвращает по порядку пары (id контакта, True - добавлен новый контакт).
+    """
+    contacts = [(tuple(contact[:3]), contact) for contact in contacts]
+    if not contacts:
+        return []
+    cursor = conn.cursor()
+    with conn:
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        existing = {}
+        for batch in batches(dict.fromkeys(name for name, _ in contacts), _IN_BATCH_SIZE // 3):
+            cursor.execute(f"""
+                SELECT c.last_name, c.first_name, c.middle_name, MIN(c.id)
+                FROM (VALUES {', '.join(['(?, ?, ?)'] * len(batch))}) AS v
+                JOIN contacts c ON c.last_name = v.column1 AND c.first_name = v.column2 AND c.middle_name = v.column3
+                GROUP BY c.last_name, c.first_name, c.middle_name
+            """, [value for name in batch for value in name])
+            existing.update((tuple(row[:3]), row[3]) for row in cursor.fetchall())
+
+        merged_phones, new = [], {}
+        for name, (last_name, first_name, middle_name, phones, email, dob) in contacts:
+            if name in existing:
+                merged_phones.extend(_phone_row(existing[name], phone) for phone in _unique_phones(phones))
+            elif name in new:
+                new[name][3].extend(phones)
+            else:
+                new[name] = (last_name, first_name, middle_name, list(phones), email, dob)
+        # Уже сохраненные номера отсекает UNIQUE(contact_id, phone_normalized)
+        cursor.executemany("INSERT OR IGNORE INTO phone_numbers (contact_id, phone_number, phone_normalized, phone_reversed) VALUES (?, ?, ?, ?)", merged_phones)
+        # add_contacts идет последним: он фиксирует транзакцию вместе с добавленными выше номерами
+        created = dict(zip(new, add_contacts(conn, new.values())))
+
+    result, seen = [], set()
+    for name, _ in contacts:
+        if name in existing:
+            result.append((existing[name], False))
+        else:
+            result.append((created[name], name not in seen))
+            seen.add(name)
+    return result
 
-def get_phone_numbers(conn, contact_id):
-    """Возвращает список номеров телефонов для указанного контакта."""
+# Поля контакта, которые можно изменить через edit_contacts
+EDITABLE_FIELDS = ('last_name', 'first_name', 'middle_name', 'email', 'dob', 'phones')
+
+# Наибольшее число параметров в одном запросе с IN (...)
+_IN_BATCH_SIZE = 500
+
+def batches(items, size=_IN_BATCH_SIZE):
+    """Делит items на списки не длиннее size - для запросов с IN (...)."""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Причина отказа для изменений контакта, которого нет в базе
+CONTACT_NOT_FOUND = "Контакт не найден."
+
+def existing_contact_ids(conn, contact_ids):
+    """Возвращает множество тех id из contact_ids, которые есть в базе."""
+    cursor = conn.cursor()
+    existing = set()
+    for batch in batches(contact_ids):
+        cursor.execute(f"SELECT id FROM contacts WHERE id IN ({', '.join('?' * len(batch))})", batch)
+        existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+def validate_changes(fields):
+    """Проверяет изменения одного контакта, в том числе типы значений. Возвращает текст ошибки или None."""
+    unknown = set(fields) - set(EDITABLE_FIELDS)
+    if unknown:
+        return f"Неизвестные поля: {', '.join(sorted(unknown))}."
+    for field in ('last_name', 'first_name', 'middle_name'):
+        if field in fields and not isinstance(fields[field], str):
+            return f"Поле {field} должно быть строкой."
+    for field in ('email', 'dob'):
+        if fields.get(field) is not None and not isinstance(fields[field], str):
+            return f"Поле {field} должно быть строкой."
+    if 'phones' in fields and (not isinstance(fields['phones'], (list, tuple)) or not all(isinstance(phone, str) for phone in fields['phones'])):
+        return "Поле phones должно быть списком строк."
+    if 'phones' in fields:
+        return validate_contact(fields['phones'], fields.get('email'), fields.get('dob'))
+    if fields.get('email') and not validate_email(fields['email']):
+        return "Некорректный формат email."
+    if fields.get('dob') and not validate_date(fields['dob']):
+        return "Некорректный формат даты рождения."
+    return None
+
+def edit_contacts(conn, changes, cache=None):
+    """
+    Редактирует пачку контактов по id одной транзакцией, без вопросов пользователю.
+    changes - словарь id -> словарь новых значений полей из EDITABLE_FIELDS; phones заменяет
+    весь список номеров, но в базе удаляются только исчезнувшие и добавляются только новые номера.
+    Возвращает отчет: число отредактированных контактов и список отклоненных изменений (id, причина).
+    """
+    report = {'updated': 0, 'rejected': []}
+    valid = {}
+    for contact_id, fields in changes.items():
+        error = validate_changes(fields)
+        if error:
+            report['rejected'].append((contact_id, error))
+        else:
+            valid[contact_id] = fields
+    if not valid:
+        return report
+
+    cursor = conn.cursor()
+    with conn:
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        existing_ids = existing_contact_ids(conn, valid)
+        for contact_id in [contact_id for contact_id in valid if contact_id not in existing_ids]:
+            report['rejected'].append((contact_id, CONTACT_NOT_FOUND))
+            del valid[contact_id]
+
+        # Контакты с одинаковым набором изменяемых полей обновляются одним executemany
+        updates = {}
+        for contact_id, fields in valid.items():
+            columns = tuple(column for column in EDITABLE_FIELDS[:-1] if column in fields)
+            if columns:
+                updates.setdefault(columns, []).append((*(fields[column] for column in columns), contact_id))
+        for columns, rows in updates.items():
+            cursor.executemany(f"UPDATE contacts SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?", rows)
+
+        new_phones = {contact_id: _unique_phones(fields['phones']) for contact_id, fields in valid.items() if 'phones' in fields}
+        final_phones = _sync_phones(cursor, new_phones)
+    report['updated'] = len(valid)
+
+    if cache is not None:
+        for contact_id, fields in valid.items():
+            cache.update(contact_id, {**fields, 'phones': final_phones[contact_id]} if contact_id in final_phones else fields)
+    return report
+
+def _sync_phones(cursor, new_phones):
+    """
+    Приводит номера телефонов контактов к новым спискам (id -> номера), сравнивая их
+    со старыми по нормализованному виду и записывая только отличия.
+    Возвращает итоговые списки номеров в порядке их хранения.
+    """
+    old_phones = {contact_id: [] for contact_id in new_phones}
+    for batch in batches(new_phones):
+        cursor.execute(f"""
+            SELECT id, contact_id, phone_number, phone_normalized FROM phone_numbers
+            WHERE contact_id IN ({', '.join('?' * len(batch))})
+            ORDER BY id
+        """, batch)
+        for row in cursor.fetchall():
+            old_phones[row[1]].append(row)
+
+    to_delete, to_rename, to_insert, final_phones = [], [], [], {}
+    for contact_id, phones in new_phones.items():
+        wanted = {normalize_phone_number(phone): phone for phone in phones}
+        kept = []
+        for phone_id, _, phone_number, normalized in old_phones[contact_id]:
+            if normalized not in wanted:
+                to_delete.append((phone_id,))
+                continue
+            # Тот же номер в другой записи: обновляем только текст
+            if wanted[normalized] != phone_number:
+                to_rename.append((wanted[normalized], phone_id))
+            kept.append(wanted.pop(normalized))
+        to_insert.extend(_phone_row(contact_id, phone) for phone in wanted.values())
+        final_phones[contact_id] = kept + list(wanted.values())
+    cursor.executemany("DELETE FROM phone_numbers WHERE id = ?", to_delete)
+    cursor.executemany("UPDATE phone_numbers SET phone_number = ? WHERE id = ?", to_rename)
+    cursor.executemany("INSERT INTO phone_numbers (contact_id, phone_number, phone_normalized, phone_reversed) VALUES (?, ?, ?, ?)", to_insert)
+    return final_phones
+
+def delete_contacts(conn, contact_ids, cache=None):
+    """
+    Удаляет пачку контактов по id одной транзакцией вместе с их номерами телефонов.
+    Возвращает число удаленных контактов.
+    """
+    contact_ids = list(contact_ids)
+    cursor = conn.cursor()
+    with conn:
+        # Номера телефонов удаляются каскадно (ON DELETE CASCADE)
+        cursor.executemany("DELETE FROM contacts WHERE id = ?", [(contact_id,) for contact_id in contact_ids])
+        deleted = cursor.rowcount
+    if cache is not None:
+        for contact_id in contact_ids:
+            cache.discard(contact_id)
+    return deleted
+
+def delete_phone_numbers(conn, phones, cache=None):
+    """
+    Удаляет номера телефонов одной транзакцией. phones - пары (id контакта, номер);
+    номер сравнивается в нормализованном виде. Возвращает число удаленных номеров.
+    """
+    phones = list(phones)
+    cursor = conn.cursor()
+    with conn:
+        cursor.executemany("DELETE FROM phone_numbers WHERE contact_id = ? AND phone_normalized = ?",
+                           [(contact_id, normalize_phone_number(phone)) for contact_id, phone in phones])
+        deleted = cursor.rowcount
+    if cache is not None:
+        for contact_id, phone in phones:
+            cache.remove_phone(contact_id, phone)
+    return deleted
+
+def get_phone_numbers(conn, contact_id, normalized=False):
+    """Возвращает список номеров телефонов для указанного контакта (при normalized=True - в нормализованном виде)."""
     cursor = conn.cursor()
-    cursor.execute("SELECT phone_number FROM phone_numbers WHERE contact_id = ?", (contact_id,))
+    column = 'phone_normalized' if normalized else 'phone_number'
+    cursor.execute(f"SELECT {column} FROM phone_numbers WHERE contact_id = ? ORDER BY id", (contact_id,))
     phone_numbers = [row[0] for row in cursor.fetchall()]
     return phone_numbers
 
-def display_contacts(contacts):
-  """Выводит список контактов на экран."""
-  if not contacts:
+def get_contact(conn, contact_id):
+    """Возвращает контакт с указанным id или None, если такого контакта нет."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, last_name, first_name, middle_name, email, dob FROM contacts WHERE id = ?", (contact_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    contact_id, last_name, first_name, middle_name, email, dob = row
+    return {'id': contact_id, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': get_phone_numbers(conn, contact_id)}
+
+def find_contacts_by_phone(conn, phone_number, suffix=False, limit=None):
+    """
+    Ищет контакты по номеру телефона в нормализованном виде через индекс по обращенным цифрам.
+    При suffix=True находит номера, оканчивающиеся на указанные цифры (как при определении звонящего).
+    """
+    reversed_digits = normalize_phone_number(phone_number)[::-1]
+    if not reversed_digits:
+        return []
+    # ':' следует сразу за '9', поэтому диапазон покрывает все номера с заданным началом обращенных цифр
+    upper = reversed_digits + ':' if suffix else reversed_digits
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.id, c.last_name, c.first_name, c.middle_name, c.email, c.dob, group_concat(pn.phone_number, ',')
+        FROM contacts c
+        JOIN phone_numbers pn ON c.id = pn.contact_id
+        WHERE c.id IN (SELECT contact_id FROM phone_numbers WHERE phone_reversed >= ? AND phone_reversed <= ?)
+        GROUP BY c.id
+        LIMIT ?
+    """, (reversed_digits, upper, -1 if limit is None else limit))
+    return [_contact_from_row(row) for row in cursor.fetchall()]
+
+# Контакт с номерами через запятую, в формате _contact_from_row; номера выбираются по индексу UNIQUE (contact_id, ...)
+_CONTACT_WITH_PHONES = """
+    SELECT c.id, c.last_name, c.first_name, c.middle_name, c.email, c.dob,
+           (SELECT group_concat(phone_number, ',') FROM phone_numbers WHERE contact_id = c.id)
+    FROM contacts c
+"""
+
+def _iso_date(value):
+    """Приводит дату (date или строку dd.mm.yyyy) к строке yyyy-mm-dd; при неверной дате - ValueError."""
+    if isinstance(value, str):
+        value = datetime.strptime(value, '%d.%m.%Y').date()
+    return value.isoformat()
+
+def find_contacts_by_birth_date(conn, start, end, limit=None):
+    """
+    Возвращает контакты, родившиеся с start по end включительно, по возрастанию даты рождения.
+    Границы - date или строки dd.mm.yyyy; выборка идет по индексу idx_contacts_dob_iso.
+    """
+    cursor = conn.cursor()
+    cursor.execute(_CONTACT_WITH_PHONES + "WHERE c.dob_iso BETWEEN ? AND ? ORDER BY c.dob_iso, c.id LIMIT ?",
+                   (_iso_date(start), _iso_date(end), -1 if limit is None else limit))
+    return [_contact_from_row(row) for row in cursor.fetchall()]
+
+def upcoming_birthdays(conn, days=7, today=None, limit=None):
+    """
+    Возвращает контакты, у которых день рождения в ближайшие days дней начиная с today
+    (по умолчанию - сегодня), в порядке наступления дня рождения.
+    Если интервал переходит через конец года, он разбивается на два диапазона по индексу idx_contacts_dob_md.
+    """
+    today = today or date.today()
+    start = today.strftime('%m-%d')
+    # Диапазоны (нижняя граница, оператор верхней границы, верхняя граница) в порядке наступления дней рождения
+    if days >= 365:
+        # Весь год, начиная с today: граница '<' не теряет 29 февраля, когда вчера было 28-е
+        ranges = [(start, '<=', '12-31'), ('01-01', '<', start)]
+    else:
+        end = (today + timedelta(days=days)).strftime('%m-%d')
+        ranges = [(start, '<=', end)] if start <= end else [(start, '<=', '12-31'), ('01-01', '<=', end)]
+    contacts = []
+    cursor = conn.cursor()
+    for low, operator, high in ranges:
+        remaining = -1 if limit is None else limit - len(contacts)
+        if remaining == 0:
+            break
+        cursor.execute(_CONTACT_WITH_PHONES + f"WHERE c.dob_md >= ? AND c.dob_md {operator} ? ORDER BY c.dob_md, c.id LIMIT ?",
+                       (low, high, remaining))
+        contacts.extend(_contact_from_row(row) for row in cursor.fetchall())
+    return contacts
+
+def display_contacts(contacts, page_size=None):
+  """
+  Выводит контакты на экран. contacts может быть списком или генератором (например, iter_contacts);
+  при заданном page_size после каждой страницы спрашивает, продолжать ли вывод.
+  """
+  shown = 0
+  for contact in contacts:
+      if shown == 0:
+          print("Контакты:")
+      elif page_size and shown % page_size == 0:
+          if input("Enter - следующая страница, q - выход: ").strip().lower() == 'q':
+              return
+      print(f"{contact['last_name']} {contact['first_name']} {contact['middle_name']}: {', '.join(contact['phones'])}", end='')
+      if contact['email']:
+          print(f" Email: {contact['email']}", end='')
+      if contact['dob']:
+          print(f" Дата рождения: {contact['dob']}", end='')
+      print()
+      shown += 1
+  if shown == 0:
       print("Справочник пуст.")
-  else:
-      print("Контакты:")
-      for contact in contacts:
-          print(f"{contact['last_name']} {contact['first_name']} {contact['middle_name']}: {', '.join(contact['phones'])}", end='')
-          if contact['email']:
-              print(f" Email: {contact['email']}", end='')
-          if contact['dob']:
-              print(f" Дата рождения: {contact['dob']}", end='')
-          print()
-
-def search_contacts(conn, query):
-  """Ищет контакты по имени, фамилии, отчеству, номеру телефона, email или дате рождения."""
+
+# Минимальная длина запроса для поиска по триграммам, более короткие ищутся через LIKE
+MIN_INDEXED_QUERY_LENGTH = 3
+
+def search_contacts(conn, query, limit=None):
+    """
+    Ищет контакты по имени, фамилии, отчеству, номеру телефона, email или дате рождения.
+    Использует полнотекстовый индекс contacts_fts (результаты упорядочены по релевантности),
+    а при его отсутствии или слишком коротком запросе - сканирование через LIKE.
+    """
+    contacts = _search_contacts_text(conn, query, limit)
+    # Номер телефона дополнительно ищем по нормализованному виду, чтобы "79991234567" находил "+7 (999) 123-45-67"
+    if validate_phone_number(query) and len(normalize_phone_number(query)) >= MIN_INDEXED_QUERY_LENGTH:
+        found = {contact['id'] for contact in contacts}
+        contacts += [contact for contact in find_contacts_by_phone(conn, query, suffix=True, limit=limit) if contact['id'] not in found]
+    return contacts if limit is None else contacts[:limit]
+
+def _search_contacts_text(conn, query, limit=None):
+    """Ищет контакты по тексту полей через contacts_fts или, если индекс неприменим, через LIKE."""
+    if len(query) < MIN_INDEXED_QUERY_LENGTH or not has_search_index(conn):
+        return search_contacts_like(conn, query, limit)
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT rowid, last_name, first_name, middle_name, email, dob, phones
+            FROM contacts_fts
+            WHERE contacts_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+        """, ('"' + query.replace('"', '""') + '"', -1 if limit is None else limit))
+    except sqlite3.OperationalError as e:
+        print(f"Ошибка при поиске контактов: {e}")
+        return []
+    return [_contact_from_row(row) for row in cursor.fetchall()]
+
+def search_contacts_like(conn, query, limit=None):
+  """Ищет контакты сканированием таблиц через LIKE '%query%' (без индекса)."""
   cursor = conn.cursor()
   try:
       cursor.execute("""
-          SELECT c.last_name, c.first_name, c.middle_name, c.email, c.dob, group_concat(pn.phone_number, ',')
+          SELECT c.id, c.last_name, c.first_name, c.middle_name, c.email, c.dob, group_concat(pn.phone_number, ',')
           FROM contacts c
           LEFT JOIN phone_numbers pn ON c.id = pn.contact_id
           WHERE c.last_name LIKE ? OR c.first_name LIKE ? OR c.middle_name LIKE ? OR c.email LIKE ? OR c.dob LIKE ? OR pn.phone_number LIKE ?
           GROUP BY c.id
-      """, (f"%{query}%",) * 6)
+          LIMIT ?
+      """, (f"%{query}%",) * 6 + (-1 if limit is None else limit,))
   except sqlite3.OperationalError as e:
       print(f"Ошибка при поиске контактов: {e}")
       return []
-  contacts = []
-  for last_name, first_name, middle_name, email, dob, phone_numbers in cursor.fetchall():
-      name = ' '.join((last_name, first_name, middle_name)).strip()
-      phones = [phone.strip() for phone in phone_numbers.split(',')] if phone_numbers else []
-      contacts.append({'name': name, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': phones})
-  return contacts
-
-def delete_phone_number(conn, contact_identifier):
-    """Удаляет номер телефона для указанного контакта."""
-    cursor = conn.cursor()
+  return [_contact_from_row(row) for row in cursor.fetchall()]
+
+def _choose(items, describe):
+    """Предлагает пользователю выбрать один из найденных вариантов. Возвращает выбранный или None."""
+    if len(items) == 1:
+        return items[0]
+    print("Найдено несколько контактов. Выберите контакт:")
+    for i, item in enumerate(items, start=1):
+        print(f"{i}. {describe(item)}")
+    choice = input("Введите номер выбранного контакта: ")
     try:
-        cursor.execute("""
-            SELECT c.id, c.last_name, c.first_name, c.middle_name, pn.phone_number
-            FROM contacts c
-            LEFT JOIN phone_numbers pn ON c.id = pn.contact_id
-            WHERE (c.last_name LIKE ? OR c.first_name LIKE ? OR c.middle_name LIKE ? OR c.email LIKE ?)
-        """, (f"%{contact_identifier}%",) * 4)
-    except sqlite3.OperationalError as e:
-        print(f"Ошибка при удалении номера телефона: {e}")
-        return
+        choice_index = int(choice) - 1
+    except ValueError:
+        print("Неверный формат ввода.")
+        return None
+    if 0 <= choice_index < len(items):
+        return items[choice_index]
+    print("Неверный выбор номера.")
+    return None
 
-    contact_info = cursor.fetchall()
+def contact_title(contact):
+    """Фамилия, имя и отчество контакта одной строкой."""
+    return f"{contact['last_name']} {contact['first_name']} {contact['middle_name']}"
 
-    if not contact_info:
+def edit_contact(conn, identifier, new_last_name=None, new_first_name=None, new_middle_name=None, new_phones=None, new_email=None, new_dob=None, cache=None):
+    """
+    Находит контакт по имени, фамилии, отчеству, номеру телефона, email или дате рождения
+    и заменяет его данные новыми через edit_contacts.
+    """
+    contacts = search_contacts(conn, identifier)
+    if not contacts:
         print("Контакт не найден.")
         return
-
-    if len(contact_info) == 1:
-        contact_id, last_name, first_name, middle_name, phone_number = contact_info[0]
-        print(f"Контакт: {last_name} {first_name} {middle_name}, Номер телефона: {phone_number}")
-        confirm = input("Удалить этот номер телефона? (y/n) ").lower()
-        if confirm == 'y':
-            cursor.execute("DELETE FROM phone_numbers WHERE contact_id = ? AND phone_number = ?", (contact_id, phone_number))
-            conn.commit()
-            print(f"Номер телефона {phone_number} удален из контакта.")
-        else:
-            print("Операция отменена.")
+    contact = _choose(contacts, lambda contact: f"{contact_title(contact)}: {', '.join(contact['phones'])}")
+    if contact is None:
+        return
+    fields = {'last_name': new_last_name, 'first_name': new_first_name, 'middle_name': new_middle_name,
+              'phones': new_phones, 'email': new_email, 'dob': new_dob}
+    fields = {field: value for field, value in fields.items() if value}
+    report = edit_contacts(conn, {contact['id']: fields}, cache=cache)
+    if report['rejected']:
+        print(f"{report['rejected'][0][1]} Контакт не отредактирован.")
     else:
-        print("Найдено несколько контактов. Выберите контакт:")
-        for i, (contact_id, last_name, first_name, middle_name, phone_number) in enumerate(contact_info, start=1):
-            print(f"{i}. {last_name} {first_name} {middle_name}, Номер телефона: {phone_number}")
-
-        choice = input("Введите номер выбранного контакта: ")
-        try:
-            choice_index = int(choice) - 1
-            if 0 <= choice_index < len(contact_info):
-                contact_id, last_name, first_name, middle_name, phone_number = contact_info[choice_index]
-                print(f"Контакт: {last_name} {first_name} {middle_name}, Номер телефона: {phone_number}")
-                confirm = input("Удалить этот номер телефона? (y/n) ").lower()
-                if confirm == 'y':
-                    cursor.execute("DELETE FROM phone_numbers WHERE contact_id = ? AND phone_number = ?", (contact_id, phone_number))
-                    conn.commit()
-                    print(f"Номер телефона {phone_number} удален из контакта.")
-                else:
-                    print("Операция отменена.")
-            else:
-                print("Неверный выбор номера.")
-        except ValueError:
-            print("Неверный формат ввода.")
+        print("Контакт отредактирован.")
 
-def delete_contact(conn, contact_identifier):
-    """Удаляет контакт по имени, фамилии, отчеству, номеру телефона или email."""
-    cursor = conn.cursor()
-    try:
-        cursor.execute("""
-            SELECT id, last_name, first_name, middle_name
-            FROM contacts
-            WHERE last_name LIKE ? OR first_name LIKE ? OR middle_name LIKE ? OR email LIKE ?
-        """, (f"%{contact_identifier}%",) * 4)
-    except sqlite3.OperationalError as e:
-        print(f"Ошибка при удалении контакта: {e}")
+def delete_phone_number(conn, contact_identifier, cache=None):
+    """Находит контакт и удаляет выбранный пользователем номер телефона через delete_phone_numbers."""
+    phones = [(contact, phone) for contact in search_contacts(conn, contact_identifier) for phone in contact['phones']]
+    if not phones:
+        print("Контакт не найден.")
+        return
+    selected = _choose(phones, lambda item: f"{contact_title(item[0])}, Номер телефона: {item[1]}")
+    if selected is None:
         return
-    contact_info = cursor.fetchall()
+    contact, phone_number = selected
+    print(f"Контакт: {contact_title(contact)}, Номер телефона: {phone_number}")
+    confirm = input("Удалить этот номер телефона? (y/n) ").lower()
+    if confirm == 'y':
+        delete_phone_numbers(conn, [(contact['id'], phone_number)], cache=cache)
+        print(f"Номер телефона {phone_number} удален из контакта.")
+    else:
+        print("Операция отменена.")
 
-    if not contact_info:
+def delete_contact(conn, contact_identifier, cache=None):
+    """Находит контакт по имени, фамилии, отчеству, номеру телефона или email и удаляет его через delete_contacts."""
+    contacts = search_contacts(conn, contact_identifier)
+    if not contacts:
         print("Контакт не найден.")
         return
-
-    if len(contact_info) == 1:
-        contact_id, last_name, first_name, middle_name = contact_info[0]
-        print(f"Контакт: {last_name} {first_name} {middle_name}")
-        confirm = input("Удалить этот контакт? (y/n) ").lower()
-        if confirm == 'y':
-            cursor.execute("DELETE FROM phone_numbers WHERE contact_id = ?", (contact_id,))
-            cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-            conn.commit()
-            print("Контакт удален.")
-        else:
-            print("Операция отменена.")
+    contact = _choose(contacts, contact_title)
+    if contact is None:
+        return
+    print(f"Контакт: {contact_title(contact)}")
+    confirm = input("Удалить этот контакт? (y/n) ").lower()
+    if confirm == 'y':
+        delete_contacts(conn, [contact['id']], cache=cache)
+        print("Контакт удален.")
     else:
-        print("Найдено несколько контактов. Выберите контакт:")
-        for i, (contact_id, last_name, first_name, middle_name) in enumerate(contact_info, start=1):
-            print(f"{i}. {last_name} {first_name} {middle_name}")
-
-        choice = input("Введите номер выбранного контакта: ")
-        try:
-            choice_index = int(choice) - 1
-            if 0 <= choice_index < len(contact_info):
-                contact_id, last_name, first_name, middle_name = contact_info[choice_index]
-                print(f"Контакт: {last_name} {first_name} {middle_name}")
-                confirm = input("Удалить этот контакт? (y/n) ").lower()
-                if confirm == 'y':
-                    cursor.execute("DELETE FROM phone_numbers WHERE contact_id = ?", (contact_id,))
-                    cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-                    conn.commit()
-                    print("Контакт удален.")
-                else:
-                    print("Операция отменена.")
-            else:
-                print("Неверный выбор номера.")
-        except ValueError:
-            print("Неверный формат ввода.")
+        print("Операция отменена.")
 
 def get_database_path():
   """Получает от пользователя путь к файлу базы данных."""
@@ -355,12 +950,10 @@ def get_edit_details():
   return identifier, new_last_name, new_first_name, new_middle_name, new_phones, new_email, new_dob
 
 def main():
-   global contacts
    db_path = get_database_path()
    conn = create_database(db_path)
    if conn is None:
        return
-   contacts = load_contacts(conn)
 
    while True:
        print("\nМеню:")
@@ -370,20 +963,20 @@ def main():
        print("4. Редактировать контакт")
        print("5. Удалить номер телефона")
        print("6. Удалить контакт")
-       print("7. Выход")
-       choice = input("Выберите действие (1-7): ")
+       print("7. Дни рождения на ближайшую неделю")
+       print("8. Выход")
+       choice = input("Выберите действие (1-8): ")
 
        if choice == '1':
-           display_contacts(contacts)
+           display_contacts(iter_contacts(conn), page_size=PAGE_SIZE)
        elif choice == '2':
            last_name, first_name, middle_name, phones, email, dob = get_contact_details()
            if last_name is not None:
                save_contact(conn, last_name, first_name, middle_name, phones, email, dob)
-               contacts = load_contacts(conn)
        elif choice == '3':
            query = get_search_query()
            results = search_contacts(conn, query)
-           display_contacts(results)
+           display_contacts(results, page_size=PAGE_SIZE)
        elif choice == '4':
            identifier, new_last_name, new_first_name, new_middle_name, new_phones, new_email, new_dob = get_edit_details()
            if identifier is not None:
@@ -395,6 +988,8 @@ def main():
            contact_identifier = input("Введите имя, фамилию, отчество, номер телефона или email контакта для удаления: ")
            delete_contact(conn, contact_identifier)
        elif choice == '7':
+           display_contacts(upcoming_birthdays(conn, 7), page_size=PAGE_SIZE)
+       elif choice == '8':
            conn.close()
            break
        else:
@@ -0,0 +1,60 @@
+"""Бенчмарк конкурентного чтения: QPS поиска с пулом читателей и без него при активном писателе."""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from Phone_DB import add_contacts, search_contacts
+from bench_data import SEARCH_QUERIES, fill_database, generate_contacts
+from connection_manager import ConnectionManager
+
+
+def run(db_path, readers, threads, seconds):
+    """Запускает threads потоков поиска и одного писателя на seconds секунд, возвращает QPS чтения и записи."""
+    with ConnectionManager(db_path, readers=readers) as manager:
+        stop = threading.Event()
+        counts = [0] * threads
+        writes = [0]
+
+        def read_loop(index):
+            while not stop.is_set():
+                manager.read(search_contacts, SEARCH_QUERIES[counts[index] % len(SEARCH_QUERIES)], 20)
+                counts[index] += 1
+
+        def write_loop():
+            batch = iter(generate_contacts(10 ** 9, seed=1))
+            while not stop.is_set():
+                manager.write(add_contacts, [next(batch) for _ in range(10)])
+                writes[0] += 10
+
+        workers = [threading.Thread(target=read_loop, args=(i,)) for i in range(threads)]
+        workers.append(threading.Thread(target=write_loop))
+        for worker in workers:
+            worker.start()
+        time.sleep(seconds)
+        stop.set()
+        for worker in workers:
+            worker.join()
+    return sum(counts) / seconds, writes[0] / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк чтения через пул соединений при активной записи.")
+    parser.add_argument('--contacts', type=int, default=100_000, help="размер справочника")
+    parser.add_argument('--threads', type=int, default=8, help="потоков чтения")
+    parser.add_argument('--readers', type=int, default=4, help="соединений в пуле читателей")
+    parser.add_argument('--seconds', type=float, default=5.0, help="длительность каждого замера")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        with ConnectionManager(db_path, readers=0) as manager:
+            manager.write(fill_database, args.contacts)
+        for label, readers in (("без пула", 0), (f"пул из {args.readers}", args.readers)):
+            read_qps, write_rps = run(db_path, readers, args.threads, args.seconds)
+            print(f"{label:>12}: чтение {read_qps:8.0f} запросов/с, запись {write_rps:8.0f} контактов/с")
+
+
+if __name__ == '__main__':
+    main()
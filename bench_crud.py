@@ -0,0 +1,170 @@
+"""
+Бенчмарк операций справочника на нескольких объемах базы: время и пик памяти каждой операции.
+Пик памяти считает tracemalloc, то есть только выделения Python - без собственной памяти SQLite
+(кэша страниц, временных B-деревьев сортировки).
+
+Результаты сохраняются в JSON; с --compare новый прогон сравнивается с прошлым файлом
+и выводятся операции, замедлившиеся сильнее порога.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from Phone_DB import create_database, delete_contacts, edit_contacts, iter_contacts, load_contacts, save_contact, search_contacts
+from bench_data import SEARCH_QUERIES, fill_database, generate_contacts
+from query_profiler import QueryProfiler
+
+
+def _load_all(conn, size, rnd):
+    load_contacts(conn)
+    return 1
+
+
+def _iter_all(conn, size, rnd):
+    for _ in iter_contacts(conn):
+        pass
+    return 1
+
+
+def _search(conn, size, rnd):
+    for query in SEARCH_QUERIES:
+        search_contacts(conn, query, 20)
+    return len(SEARCH_QUERIES)
+
+
+def _save(conn, size, rnd, count=200):
+    # save_contact сообщает о результате через print, в замере вывод не нужен
+    with contextlib.redirect_stdout(io.StringIO()):
+        for contact in generate_contacts(count, seed=rnd.random()):
+            save_contact(conn, *contact)
+    return count
+
+
+def _edit(conn, size, rnd, count=1000):
+    changes = {rnd.randint(1, size): {'email': f"edited{i}@example.com", 'phones': [f"+7 900 {i:07d}"]} for i in range(count)}
+    edit_contacts(conn, changes)
+    return len(changes)
+
+
+def _delete(conn, size, rnd, count=1000):
+    delete_contacts(conn, rnd.sample(range(1, size + 1), min(count, size)))
+    return min(count, size)
+
+
+# Операции по порядку запуска: имя -> функция(conn, размер базы, генератор случайных чисел), возвращающая число операций
+OPERATIONS = {
+    'load_contacts': _load_all,
+    'iter_contacts': _iter_all,
+    'search_contacts': _search,
+    'save_contact': _save,
+    'edit_contacts': _edit,
+    'delete_contacts': _delete,
+}
+
+
+def measure(func, conn, size, seed):
+    """
+    Выполняет func дважды: для замера времени и для замера пика памяти (tracemalloc замедляет выполнение).
+    Перед вторым проходом база восстанавливается из копии, а генератор случайных чисел создается заново,
+    поэтому оба замера относятся к одной и той же работе над одними и теми же данными.
+    """
+    snapshot = sqlite3.connect(':memory:')
+    conn.backup(snapshot)
+    started = time.perf_counter()
+    count = func(conn, size, random.Random(seed))
+    seconds = time.perf_counter() - started
+    snapshot.backup(conn)
+    snapshot.close()
+    tracemalloc.start()
+    func(conn, size, random.Random(seed))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, seconds, peak
+
+
+def run(sizes, seed=0, profiler=None):
+    """
+    Прогоняет все операции на базах каждого размера и возвращает список результатов.
+    С profiler запросы всех операций профилируются (это добавляет накладные расходы к замерам).
+    """
+    connect_options = {'factory': profiler.connection_class} if profiler else {}
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = create_database(os.path.join(tmp, 'bench.db'), **connect_options)
+            started = time.perf_counter()
+            fill_database(conn, size, seed)
+            results.append({'size': size, 'operation': 'fill_database', 'count': size,
+                            'seconds': time.perf_counter() - started, 'ms_per_op': None, 'peak_kib': None})
+            for name, func in OPERATIONS.items():
+                count, seconds, peak = measure(func, conn, size, seed)
+                results.append({'size': size, 'operation': name, 'count': count, 'seconds': seconds,
+                                'ms_per_op': seconds / count * 1000, 'peak_kib': peak / 1024})
+            conn.close()
+    return results
+
+
+def compare(previous, current, threshold):
+    """Возвращает строки отчета об операциях, ставших медленнее previous более чем в threshold раз."""
+    before = {(row['size'], row['operation']): row['seconds'] for row in previous['results']}
+    regressions = []
+    for row in current['results']:
+        old = before.get((row['size'], row['operation']))
+        if old and row['seconds'] / old > threshold:
+            regressions.append(f"{row['operation']} на {row['size']}: {old:.3f} с -> {row['seconds']:.3f} с "
+                               f"(x{row['seconds'] / old:.2f})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк CRUD-операций справочника.")
+    parser.add_argument('sizes', nargs='*', type=int, default=[1_000, 10_000, 100_000], help="размеры справочника")
+    parser.add_argument('--output', default='bench_results.json', help="файл для результатов")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compare', help="JSON прошлого прогона для сравнения")
+    parser.add_argument('--threshold', type=float, default=1.2, help="во сколько раз замедление считается регрессией")
+    parser.add_argument('--profile', help="JSON-файл для профиля запросов; без него профилирование выключено")
+    parser.add_argument('--slow-ms', type=float, default=100.0, help="порог медленного запроса для профиля, мс")
+    args = parser.parse_args()
+    profiler = QueryProfiler(slow_threshold_ms=args.slow_ms) if args.profile else None
+
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'seed': args.seed,
+        'results': run(args.sizes, args.seed, profiler),
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"{'размер':>8} {'операция':>16} {'всего, с':>10} {'мс/оп':>10} {'пик, КиБ':>10}")
+    for row in report['results']:
+        ms_per_op = '' if row['ms_per_op'] is None else f"{row['ms_per_op']:.3f}"
+        peak = '' if row['peak_kib'] is None else f"{row['peak_kib']:.0f}"
+        print(f"{row['size']:>8} {row['operation']:>16} {row['seconds']:>10.3f} {ms_per_op:>10} {peak:>10}")
+    print("Пик памяти - только выделения Python (tracemalloc), без собственной памяти SQLite.")
+
+    if profiler:
+        profiler.dump(args.profile)
+        print(profiler.summary())
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        for line in regressions:
+            print(f"Регрессия: {line}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
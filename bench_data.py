@@ -0,0 +1,95 @@
+"""Детерминированный генератор синтетического телефонного справочника для бенчмарков."""
+import random
+
+from Phone_DB import add_contacts
+
+MALE_FIRST_NAMES = ['Александр', 'Алексей', 'Андрей', 'Антон', 'Борис', 'Вадим', 'Василий', 'Виктор', 'Владимир',
+                    'Дмитрий', 'Евгений', 'Иван', 'Игорь', 'Константин', 'Максим', 'Михаил', 'Николай', 'Олег',
+                    'Павел', 'Петр', 'Роман', 'Сергей', 'Степан', 'Юрий']
+FEMALE_FIRST_NAMES = ['Анастасия', 'Анна', 'Валентина', 'Вера', 'Галина', 'Дарья', 'Екатерина', 'Елена', 'Ирина',
+                      'Ксения', 'Людмила', 'Мария', 'Наталья', 'Ольга', 'Полина', 'Светлана', 'София', 'Татьяна']
+# Отчества строятся от мужских имен: основа + окончание по полу
+PATRONYMIC_STEMS = ['Александров', 'Алексеев', 'Андреев', 'Борисов', 'Васильев', 'Викторов', 'Владимиров',
+                    'Дмитриев', 'Евгеньев', 'Иванов', 'Игорев', 'Константинов', 'Максимов', 'Михайлов',
+                    'Николаев', 'Олегов', 'Павлов', 'Петров', 'Романов', 'Сергеев', 'Степанов', 'Юрьев']
+# Мужские фамилии; женская форма получается по окончанию
+LAST_NAMES = ['Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев', 'Петров', 'Соколов', 'Михайлов', 'Новиков',
+              'Федоров', 'Морозов', 'Волков', 'Алексеев', 'Лебедев', 'Семенов', 'Егоров', 'Павлов', 'Козлов',
+              'Степанов', 'Николаев', 'Орлов', 'Андреев', 'Макаров', 'Никитин', 'Захаров', 'Зайцев', 'Соловьев',
+              'Борисов', 'Яковлев', 'Григорьев', 'Романов', 'Воробьев', 'Сергеев', 'Кузьмин', 'Фролов',
+              'Александров', 'Дмитриев', 'Королев', 'Гусев', 'Киселев', 'Ильин', 'Максимов', 'Поляков',
+              'Сорокин', 'Виноградов', 'Ковалев', 'Белов', 'Медведев', 'Антонов', 'Тарасов', 'Жуков',
+              'Баранов', 'Филиппов', 'Комаров', 'Давыдов', 'Беляев', 'Герасимов', 'Богданов', 'Осипов',
+              'Сидоров', 'Матвеев', 'Титов', 'Марков', 'Миронов', 'Крылов', 'Куликов', 'Карпов', 'Власов',
+              'Мельников', 'Денисов', 'Гаврилов', 'Тихонов', 'Казаков', 'Афанасьев', 'Данилов', 'Савельев',
+              'Тимофеев', 'Фомин', 'Чернов', 'Абрамов', 'Мартынов', 'Ефимов', 'Федотов', 'Щербаков',
+              'Назаров', 'Калинин', 'Исаев', 'Чернышев', 'Быков', 'Маслов', 'Родионов', 'Коновалов',
+              'Лазарев', 'Воронин', 'Климов', 'Филатов', 'Пономарев', 'Голубев', 'Кудрявцев', 'Прохоров',
+              'Наумов', 'Потапов', 'Журавлев', 'Овчинников', 'Трофимов', 'Леонов', 'Соболев', 'Ермаков',
+              'Колесников', 'Гончаров', 'Емельянов', 'Никифоров', 'Грачев', 'Котов', 'Гришин', 'Ефремов',
+              'Архипов', 'Громов', 'Кириллов', 'Малышев', 'Панов', 'Моисеев', 'Румянцев', 'Акимов',
+              'Кондратьев', 'Бирюков', 'Горбунов', 'Анисимов', 'Еремин', 'Тихомиров', 'Галкин', 'Лукьянов',
+              'Михеев', 'Скворцов', 'Юдин', 'Белоусов', 'Нестеров', 'Симонов', 'Прокофьев', 'Харитонов',
+              'Князев', 'Цветков', 'Левин', 'Митрофанов', 'Воронов', 'Аксенов', 'Софронов', 'Мальцев',
+              'Логинов', 'Горшков', 'Савин', 'Краснов', 'Майоров', 'Демидов', 'Елисеев', 'Рыбаков',
+              'Сафонов', 'Плотников', 'Демин', 'Хохлов', 'Жданов', 'Островский', 'Вишневский', 'Ковальский']
+EMAIL_DOMAINS = ['mail.ru', 'yandex.ru', 'gmail.com', 'bk.ru', 'inbox.ru', 'rambler.ru']
+PHONE_FORMATS = ['+7 ({code}) {a}-{b}-{c}', '8{code}{a}{b}{c}', '+7{code}{a}{b}{c}', '8 {code} {a} {b} {c}', '8-{code}-{a}-{b}-{c}']
+# Типичные поисковые запросы к сгенерированному справочнику: ФИО, часть номера, email, дата и промах
+SEARCH_QUERIES = ['Смирнова', 'Петрович', 'Ольга', '912', 'yandex', '.05.1980', 'Несуществующий']
+
+_TRANSLIT = dict(zip('абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+                     ['a', 'b', 'v', 'g', 'd', 'e', 'e', 'zh', 'z', 'i', 'y', 'k', 'l', 'm', 'n', 'o', 'p', 'r', 's', 't',
+                      'u', 'f', 'kh', 'ts', 'ch', 'sh', 'shch', '', 'y', '', 'e', 'yu', 'ya']))
+
+
+def transliterate(text):
+    """Транслитерирует русский текст латиницей (для генерации email)."""
+    return ''.join(_TRANSLIT.get(char, char) for char in text.lower())
+
+
+def female_last_name(last_name):
+    """Женская форма фамилии: Иванов -> Иванова, Островский -> Островская."""
+    if last_name.endswith('ский'):
+        return last_name[:-2] + 'ая'
+    if last_name.endswith(('ов', 'ев', 'ин')):
+        return last_name + 'а'
+    return last_name
+
+
+def generate_contacts(count, seed=0):
+    """
+    Генерирует count контактов в формате add_contacts: (фамилия, имя, отчество, номера, email, дата рождения).
+    При одинаковых seed и count результат всегда один и тот же.
+    """
+    rnd = random.Random(seed)
+    for i in range(count):
+        last_name = rnd.choice(LAST_NAMES)
+        if rnd.random() < 0.5:
+            first_name, middle_name = rnd.choice(MALE_FIRST_NAMES), rnd.choice(PATRONYMIC_STEMS) + 'ич'
+        else:
+            last_name = female_last_name(last_name)
+            first_name, middle_name = rnd.choice(FEMALE_FIRST_NAMES), rnd.choice(PATRONYMIC_STEMS) + 'на'
+        if rnd.random() < 0.1:
+            middle_name = ''
+        phones = [rnd.choice(PHONE_FORMATS).format(code=f"9{rnd.randint(0, 99):02d}", a=f"{rnd.randint(0, 999):03d}",
+                                                   b=f"{rnd.randint(0, 99):02d}", c=f"{rnd.randint(0, 99):02d}")
+                  for _ in range(rnd.choices((1, 2, 3), weights=(70, 25, 5))[0])]
+        email = None
+        if rnd.random() < 0.7:
+            email = f"{transliterate(first_name)[0]}.{transliterate(last_name)}{i}@{rnd.choice(EMAIL_DOMAINS)}"
+        dob = None
+        if rnd.random() < 0.8:
+            dob = f"{rnd.randint(1, 28):02d}.{rnd.randint(1, 12):02d}.{rnd.randint(1940, 2010)}"
+        yield last_name, first_name, middle_name, phones, email, dob
+
+
+def fill_database(conn, count, seed=0, chunk_size=10000):
+    """Заполняет базу count сгенерированными контактами пачками по chunk_size."""
+    chunk = []
+    for contact in generate_contacts(count, seed):
+        chunk.append(contact)
+        if len(chunk) >= chunk_size:
+            add_contacts(conn, chunk)
+            chunk = []
+    add_contacts(conn, chunk)
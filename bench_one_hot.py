@@ -0,0 +1,85 @@
+"""
+Сравнение OneHotEncoder с подходами скриптов "One-hot (alternative)" и "One-hot (pd.series)".
+
+Скрипты нельзя импортировать (в именах файлов пробелы и нет .py), поэтому их логика
+повторена ниже функциями без изменений.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from one_hot import OneHotEncoder
+
+
+def script_alternative(data, column):
+    """Логика "One-hot (alternative)": столбец на каждую категорию через apply с lambda по каждой строке."""
+    one_hot_encoded = pd.DataFrame()
+    for label in data[column].unique():
+        one_hot_encoded[label] = data[column].apply(lambda x: 1 if x == label else 0)
+    return pd.concat([data, one_hot_encoded], axis=1)
+
+
+def script_pd_series(data, column):
+    """Логика "One-hot (pd.series)": новый pd.Series на каждую строку."""
+    one_hot_encoded = pd.DataFrame.from_records(
+        data[column].map(
+            lambda x: pd.Series([1 if x == label else 0 for label in data[column].unique()], index=data[column].unique())
+        )
+    )
+    return pd.concat([data, one_hot_encoded], axis=1)
+
+
+def encoder(data, column):
+    return pd.concat([data, OneHotEncoder([column], prefix_sep=None).fit_transform(data)], axis=1)
+
+
+# Подходы для сравнения: имя -> функция(data, column), возвращающая data с one-hot столбцами
+APPROACHES = {
+    'OneHotEncoder': encoder,
+    'alternative': script_alternative,
+    'pd.series': script_pd_series,
+}
+
+
+def make_data(rows, labels, seed=0):
+    """DataFrame со столбцом whoAmI из rows случайных значений среди labels категорий."""
+    rnd = np.random.default_rng(seed)
+    return pd.DataFrame({'whoAmI': np.array([f"label{i}" for i in range(labels)], dtype=object)[rnd.integers(0, labels, rows)]})
+
+
+def same_result(expected, actual):
+    """Сравнивает значения one-hot столбцов без учета порядка столбцов и типа (int64 в скриптах, uint8 у кодировщика)."""
+    columns = sorted(expected.columns[1:])
+    return sorted(actual.columns[1:]) == columns and (expected[columns].to_numpy() == actual[columns].to_numpy()).all()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк one-hot кодирования: OneHotEncoder против исходных скриптов.")
+    parser.add_argument('sizes', nargs='*', type=int, default=[1_000, 10_000, 100_000, 1_000_000], help="число строк")
+    parser.add_argument('--labels', type=int, default=10, help="число категорий")
+    parser.add_argument('--script-max-rows', type=int, default=10_000,
+                        help="наибольшее число строк для подходов скриптов (они работают на порядки медленнее)")
+    args = parser.parse_args()
+
+    print(f"{'строк':>10}" + ''.join(f" {name + ', мс':>18}" for name in APPROACHES))
+    for rows in args.sizes:
+        data = make_data(rows, args.labels)
+        expected, cells = None, []
+        for name, approach in APPROACHES.items():
+            if name != 'OneHotEncoder' and rows > args.script_max_rows:
+                cells.append('-')
+                continue
+            started = time.perf_counter()
+            result = approach(data, 'whoAmI')
+            cells.append(f"{(time.perf_counter() - started) * 1000:.1f}")
+            if expected is None:
+                expected = result
+            elif not same_result(expected, result):
+                cells[-1] += ' (!)'
+        print(f"{rows:>10}" + ''.join(f" {cell:>18}" for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Сравнение скорости поиска через индекс contacts_fts и через LIKE '%query%' на разных объемах справочника."""
+import argparse
+import os
+import tempfile
+import time
+
+from Phone_DB import create_database, search_contacts, search_contacts_like
+from bench_data import SEARCH_QUERIES, fill_database
+
+
+def time_queries(search, conn, queries, limit):
+    started = time.perf_counter()
+    for query in queries:
+        search(conn, query, limit)
+    return (time.perf_counter() - started) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк поиска: FTS5 trigram против LIKE.")
+    parser.add_argument('sizes', nargs='*', type=int, default=[10_000, 100_000, 1_000_000], help="размеры справочника")
+    parser.add_argument('--limit', type=int, default=20, help="LIMIT для поиска")
+    args = parser.parse_args()
+
+    print(f"{'контактов':>10} {'FTS, мс':>10} {'LIKE, мс':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = create_database(os.path.join(tmp, 'bench.db'))
+            fill_database(conn, size)
+            fts_ms = time_queries(search_contacts, conn, SEARCH_QUERIES, args.limit)
+            like_ms = time_queries(search_contacts_like, conn, SEARCH_QUERIES, args.limit)
+            conn.close()
+        print(f"{size:>10} {fts_ms:>10.2f} {like_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Генератор нагрузки для phonebook_service: задержки p50/p99 и пропускная способность по видам запросов."""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from urllib.parse import quote
+
+from bench_data import SEARCH_QUERIES, fill_database, generate_contacts
+from connection_manager import ConnectionManager
+from phonebook_service import PhonebookService
+
+async def request(reader, writer, method, target, payload=None):
+    """Отправляет запрос по открытому keep-alive соединению и возвращает (код ответа, тело)."""
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    writer.write(f"{method} {target} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    data = await reader.readexactly(length) if length else b''
+    return status, json.loads(data) if data else None
+
+
+async def client(host, port, seconds, contacts, rnd, latencies):
+    """Один клиент: в цикле выполняет смесь поиска, чтения, добавления и изменения контактов."""
+    reader, writer = await asyncio.open_connection(host, port)
+    new_contacts = generate_contacts(10 ** 9, seed=rnd.random())
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        kind = rnd.choices(('search', 'get', 'add', 'edit'), weights=(50, 30, 10, 10))[0]
+        if kind == 'search':
+            args = ('GET', f"/contacts?q={quote(rnd.choice(SEARCH_QUERIES))}&limit=20")
+        elif kind == 'get':
+            args = ('GET', f"/contacts/{rnd.randint(1, contacts)}")
+        elif kind == 'add':
+            last_name, first_name, middle_name, phones, email, dob = next(new_contacts)
+            args = ('POST', '/contacts', {'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name,
+                                          'phones': phones, 'email': email, 'dob': dob})
+        else:
+            args = ('PATCH', f"/contacts/{rnd.randint(1, contacts)}", {'email': f"edited{rnd.randint(0, 10 ** 6)}@example.com"})
+        started = time.perf_counter()
+        await request(reader, writer, *args)
+        latencies.setdefault(kind, []).append(time.perf_counter() - started)
+    writer.close()
+
+
+def percentile(values, fraction):
+    return statistics.quantiles(values, n=100, method='inclusive')[round(fraction * 100) - 1] if len(values) > 1 else values[0]
+
+
+async def run(host, port, clients, seconds, contacts):
+    latencies = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, seconds, contacts, random.Random(i), latencies) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    print(f"{'запрос':>8} {'кол-во':>8} {'в сек':>8} {'p50, мс':>8} {'p99, мс':>8}")
+    for kind, values in sorted(latencies.items()):
+        print(f"{kind:>8} {len(values):>8} {len(values) / elapsed:>8.0f} "
+              f"{percentile(values, 0.5) * 1000:>8.2f} {percentile(values, 0.99) * 1000:>8.2f}")
+    total = sum(len(values) for values in latencies.values())
+    print(f"{'всего':>8} {total:>8} {total / elapsed:>8.0f}")
+
+
+async def run_local(args):
+    """Поднимает сервис на временной базе в этом же процессе и нагружает его."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        with ConnectionManager(db_path, readers=0) as manager:
+            manager.write(fill_database, args.contacts)
+        service = PhonebookService(db_path, workers=args.workers)
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            await run('127.0.0.1', port, args.clients, args.seconds, args.contacts)
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для HTTP-сервиса справочника.")
+    parser.add_argument('--url', help="host:port работающего сервиса; без него сервис поднимается на временной базе")
+    parser.add_argument('--contacts', type=int, default=10_000, help="размер справочника (id контактов 1..N)")
+    parser.add_argument('--clients', type=int, default=32, help="одновременных клиентов")
+    parser.add_argument('--seconds', type=float, default=10.0, help="длительность нагрузки")
+    parser.add_argument('--workers', type=int, default=4, help="потоков сервиса при локальном запуске")
+    args = parser.parse_args()
+    if args.url:
+        host, _, port = args.url.rpartition(':')
+        asyncio.run(run(host, int(port), args.clients, args.seconds, args.contacts))
+    else:
+        asyncio.run(run_local(args))
+
+
+if __name__ == '__main__':
+    main()
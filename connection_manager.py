@@ -0,0 +1,100 @@
+"""Менеджер соединений SQLite для многопоточного доступа: WAL, настройка PRAGMA, пул читателей и один писатель."""
+import pathlib
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from Phone_DB import create_database
+
+
+class ConnectionManager:
+    """
+    Раздает соединения с базой справочника потокам сервиса.
+
+    Запись идет через единственное соединение под блокировкой, чтение - через пул
+    соединений только для чтения. Благодаря WAL читатели не блокируются писателем.
+    Функции Phone_DB принимают соединение, поэтому работают через менеджер без изменений:
+
+        with manager.writer() as conn:
+            save_contact(conn, ...)
+        with manager.reader() as conn:
+            search_contacts(conn, query)
+    """
+
+    def __init__(self, db_path, readers=4, synchronous='NORMAL', cache_size_kib=64 * 1024,
+                 mmap_size=256 * 1024 * 1024, busy_timeout_ms=5000, **connect_options):
+        if db_path == ':memory:':
+            raise ValueError("Пул соединений требует файла базы данных, а не ':memory:'")
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.cache_size_kib = cache_size_kib
+        self.mmap_size = mmap_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self._connect_options = connect_options
+        self._write_lock = threading.Lock()
+
+        self._writer = create_database(db_path, check_same_thread=False, **connect_options)
+        if self._writer is None:
+            raise sqlite3.DatabaseError(f"Не удалось открыть базу данных {db_path}")
+        self._writer.execute("PRAGMA journal_mode = WAL")
+        self._configure(self._writer)
+
+        self._readers = queue.Queue()
+        self._all_readers = []
+        for _ in range(readers):
+            conn = sqlite3.connect(pathlib.Path(db_path).resolve().as_uri() + '?mode=ro', uri=True,
+                                   check_same_thread=False, **connect_options)
+            self._configure(conn)
+            conn.execute("PRAGMA query_only = ON")
+            self._all_readers.append(conn)
+            self._readers.put(conn)
+
+    def _configure(self, conn):
+        """Настраивает PRAGMA соединения: синхронизацию, кэш страниц, отображение в память и ожидание блокировок."""
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kib)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+
+    @contextmanager
+    def writer(self):
+        """Выдает единственное соединение для записи; одновременно им владеет только один поток."""
+        with self._write_lock:
+            yield self._writer
+
+    @contextmanager
+    def reader(self):
+        """Выдает соединение только для чтения из пула; без пула (readers=0) - соединение писателя."""
+        if not self._all_readers:
+            with self.writer() as conn:
+                yield conn
+            return
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def read(self, func, *args, **kwargs):
+        """Вызывает func(conn, *args, **kwargs) с соединением для чтения."""
+        with self.reader() as conn:
+            return func(conn, *args, **kwargs)
+
+    def write(self, func, *args, **kwargs):
+        """Вызывает func(conn, *args, **kwargs) с соединением для записи."""
+        with self.writer() as conn:
+            return func(conn, *args, **kwargs)
+
+    def close(self):
+        """Закрывает все соединения."""
+        for conn in self._all_readers:
+            conn.close()
+        with self._write_lock:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
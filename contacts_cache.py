@@ -0,0 +1,101 @@
+"""Кэш контактов в памяти, который обновляется на месте при изменениях вместо полной перезагрузки."""
+import threading
+from collections import OrderedDict
+
+from Phone_DB import get_contact, normalize_phone_number
+
+
+class ContactCache:
+    """
+    Кэш контактов по id с вытеснением давно не используемых записей (LRU).
+
+    Функции save_contact, edit_contact, delete_contact и delete_phone_number, получив кэш
+    в параметре cache, сами обновляют в нем измененные контакты. Изменения, сделанные другими
+    соединениями или процессами, обнаруживаются по PRAGMA data_version - тогда кэш очищается.
+    """
+
+    def __init__(self, conn, max_size=None):
+        self.conn = conn
+        self.max_size = max_size
+        self._contacts = OrderedDict()
+        self._lock = threading.RLock()
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_data_version(self):
+        """Очищает кэш, если базу изменило другое соединение."""
+        data_version = self._read_data_version()
+        if data_version != self._data_version:
+            self._contacts.clear()
+            self._data_version = data_version
+
+    def _store(self, contact):
+        self._contacts[contact['id']] = contact
+        self._contacts.move_to_end(contact['id'])
+        if self.max_size is not None:
+            while len(self._contacts) > self.max_size:
+                self._contacts.popitem(last=False)
+
+    def get(self, contact_id):
+        """Возвращает контакт по id, при промахе загружает его из базы. None - если контакта нет."""
+        with self._lock:
+            self._check_data_version()
+            contact = self._contacts.get(contact_id)
+            if contact is not None:
+                self._contacts.move_to_end(contact_id)
+                return contact
+            contact = get_contact(self.conn, contact_id)
+            if contact is not None:
+                self._store(contact)
+            return contact
+
+    def put(self, contact):
+        """Добавляет в кэш только что сохраненный контакт."""
+        with self._lock:
+            self._check_data_version()
+            self._store(contact)
+
+    def update(self, contact_id, changes):
+        """Применяет к закэшированному контакту измененные поля (словарь поле -> значение)."""
+        with self._lock:
+            self._check_data_version()
+            contact = self._contacts.get(contact_id)
+            if contact is not None:
+                contact.update(changes)
+
+    def add_phones(self, contact_id, phones):
+        """Добавляет к закэшированному контакту номера телефонов, которых у него еще нет."""
+        with self._lock:
+            self._check_data_version()
+            contact = self._contacts.get(contact_id)
+            if contact is not None:
+                existing = {normalize_phone_number(phone) for phone in contact['phones']}
+                contact['phones'] = contact['phones'] + [phone for phone in phones if normalize_phone_number(phone) not in existing]
+
+    def remove_phone(self, contact_id, phone_number):
+        """Удаляет номер телефона у закэшированного контакта (сравнение по нормализованному виду)."""
+        with self._lock:
+            self._check_data_version()
+            contact = self._contacts.get(contact_id)
+            if contact is not None:
+                normalized = normalize_phone_number(phone_number)
+                contact['phones'] = [phone for phone in contact['phones'] if normalize_phone_number(phone) != normalized]
+
+    def discard(self, contact_id):
+        """Удаляет контакт из кэша."""
+        with self._lock:
+            self._contacts.pop(contact_id, None)
+
+    def clear(self):
+        """Полностью очищает кэш."""
+        with self._lock:
+            self._contacts.clear()
+            self._data_version = self._read_data_version()
+
+    def __contains__(self, contact_id):
+        return contact_id in self._contacts
+
+    def __len__(self):
+        return len(self._contacts)
@@ -0,0 +1,130 @@
+"""Потоковый экспорт контактов в CSV, JSON Lines и vCard с постоянным расходом памяти."""
+import argparse
+import csv
+import json
+import re
+import time
+from itertools import groupby
+
+from Phone_DB import create_database
+from contacts_import import CSV_FIELDS
+
+# Размер буфера файла экспорта, байт
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def iter_export_contacts(conn):
+    """
+    Перебирает все контакты по возрастанию id, читая контакты вместе с номерами одним запросом.
+    Строки одного контакта идут подряд, поэтому в памяти держится только текущий контакт.
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT c.id, c.last_name, c.first_name, c.middle_name, c.email, c.dob, pn.phone_number
+        FROM contacts c
+        LEFT JOIN phone_numbers pn ON pn.contact_id = c.id
+        ORDER BY c.id, pn.id
+    """)
+    for contact_id, rows in groupby(cursor, key=lambda row: row[0]):
+        first = next(rows)
+        _, last_name, first_name, middle_name, email, dob, phone_number = first
+        phones = [phone_number] if phone_number is not None else []
+        phones.extend(row[6] for row in rows)
+        yield {'id': contact_id, 'last_name': last_name, 'first_name': first_name, 'middle_name': middle_name, 'email': email, 'dob': dob, 'phones': phones}
+
+
+def write_csv(f, contacts):
+    """Пишет контакты в CSV с колонками CSV_FIELDS (формат contacts_import.read_csv)."""
+    writer = csv.writer(f)
+    writer.writerow(CSV_FIELDS)
+    for contact in contacts:
+        writer.writerow([', '.join(contact['phones']) if field == 'phones' else contact[field] or '' for field in CSV_FIELDS])
+        yield
+
+
+def write_jsonl(f, contacts):
+    """Пишет контакты в JSON Lines: по одному объекту контакта на строку."""
+    for contact in contacts:
+        f.write(json.dumps(contact, ensure_ascii=False))
+        f.write('\n')
+        yield
+
+
+def _vcard_escape(value):
+    return re.sub(r'([\\;,])', r'\\\1', value or '').replace('\n', '\\n')
+
+
+def write_vcard(f, contacts):
+    """Пишет контакты в vCard 3.0 (формат contacts_import.read_vcard)."""
+    for contact in contacts:
+        names = [_vcard_escape(contact[field]) for field in ('last_name', 'first_name', 'middle_name')]
+        lines = ['BEGIN:VCARD', 'VERSION:3.0', f"N:{';'.join(names)};;",
+                 f"FN:{' '.join(name for name in (names[1], names[2], names[0]) if name)}"]
+        lines.extend(f"TEL:{_vcard_escape(phone)}" for phone in contact['phones'])
+        if contact['email']:
+            lines.append(f"EMAIL:{_vcard_escape(contact['email'])}")
+        match = re.match(r'^(\d{2})\.(\d{2})\.(\d{4})$', contact['dob'] or '')
+        if match:
+            day, month, year = match.groups()
+            lines.append(f"BDAY:{year}-{month}-{day}")
+        lines.append('END:VCARD')
+        f.write('\r\n'.join(lines))
+        f.write('\r\n')
+        yield
+
+
+# Каждый писатель - генератор, который выдает None после записи очередного контакта
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl, 'vcf': write_vcard, 'vcard': write_vcard}
+
+
+def export_contacts(conn, path, fmt=None, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Экспортирует все контакты в файл формата fmt (по умолчанию - по расширению path).
+    Чтение идет в одной транзакции, поэтому файл соответствует одному состоянию базы.
+    Запись другими соединениями во время экспорта не блокируется, только если conn в режиме WAL
+    (PRAGMA journal_mode = WAL, как у ConnectionManager): с журналом отката транзакция чтения
+    держит разделяемую блокировку файла, и писатели до конца экспорта получают "database is locked".
+    Возвращает отчет: число контактов, размер файла, время работы и скорость в контактах в секунду.
+    """
+    fmt = (fmt or path.rsplit('.', 1)[-1]).lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Неизвестный формат экспорта: {fmt}")
+    report = {'exported': 0, 'bytes': 0, 'seconds': 0.0, 'rows_per_sec': 0.0}
+    started = time.perf_counter()
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        with open(path, 'w', encoding='utf-8', newline='', buffering=buffer_size) as f:
+            for _ in WRITERS[fmt](f, iter_export_contacts(conn)):
+                report['exported'] += 1
+            report['bytes'] = f.tell()
+    finally:
+        # Транзакция только читала, откат лишь освобождает снимок базы
+        if own_transaction:
+            conn.rollback()
+    report['seconds'] = time.perf_counter() - started
+    report['rows_per_sec'] = report['exported'] / report['seconds'] if report['seconds'] else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Экспорт контактов в CSV, JSON Lines или vCard.")
+    parser.add_argument('db_path', help="файл базы данных")
+    parser.add_argument('path', help="файл для экспорта (.csv, .jsonl или .vcf)")
+    parser.add_argument('--format', choices=sorted(WRITERS), help="формат файла, по умолчанию - по расширению")
+    args = parser.parse_args()
+
+    conn = create_database(args.db_path)
+    if conn is None:
+        return
+    # Без WAL экспорт блокировал бы запись в базу; режим сохраняется в файле, как после ConnectionManager
+    conn.execute("PRAGMA journal_mode = WAL")
+    report = export_contacts(conn, args.path, args.format)
+    conn.close()
+    print(f"Экспортировано: {report['exported']}, {report['bytes'] / 1024 / 1024:.1f} МиБ, "
+          f"{report['seconds']:.2f} с, {report['rows_per_sec']:.0f} контактов/с")
+
+
+if __name__ == '__main__':
+    main()
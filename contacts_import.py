@@ -0,0 +1,149 @@
+"""Массовый импорт контактов из CSV и vCard в базу телефонного справочника."""
+import argparse
+import csv
+import re
+import time
+
+from Phone_DB import add_contacts, create_database, validate_contact
+
+# Колонки CSV-файла; номера телефонов внутри ячейки разделяются запятой или точкой с запятой
+CSV_FIELDS = ('last_name', 'first_name', 'middle_name', 'phones', 'email', 'dob')
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def split_phones(value):
+    """Разбивает ячейку с номерами телефонов на отдельные номера."""
+    return [phone.strip() for phone in re.split(r'[;,]', value or '') if phone.strip()]
+
+
+def read_csv(path):
+    """Построчно читает CSV-файл, возвращая пары (номер строки, запись)."""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield reader.line_num, {
+                'last_name': (record.get('last_name') or '').strip(),
+                'first_name': (record.get('first_name') or '').strip(),
+                'middle_name': (record.get('middle_name') or '').strip(),
+                'phones': split_phones(record.get('phones')),
+                'email': (record.get('email') or '').strip() or None,
+                'dob': (record.get('dob') or '').strip() or None,
+            }
+
+
+def _vcard_unescape(value):
+    return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+
+def _vcard_date(value):
+    """Переводит дату из формата vCard (yyyy-mm-dd или yyyymmdd) в dd.mm.yyyy."""
+    match = re.match(r'^(\d{4})-?(\d{2})-?(\d{2})', value)
+    if match:
+        year, month, day = match.groups()
+        return f"{day}.{month}.{year}"
+    return value
+
+
+def _vcard_lines(f):
+    """Склеивает свернутые строки vCard (продолжение начинается с пробела или табуляции)."""
+    line_no, buffer = 0, None
+    for number, line in enumerate(f, start=1):
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and buffer is not None:
+            buffer += line[1:]
+            continue
+        if buffer is not None:
+            yield line_no, buffer
+        line_no, buffer = number, line
+    if buffer is not None:
+        yield line_no, buffer
+
+
+def read_vcard(path):
+    """Потоково читает vCard-файл, возвращая пары (номер строки BEGIN:VCARD, запись)."""
+    with open(path, encoding='utf-8-sig') as f:
+        record, start = None, 0
+        for line_no, line in _vcard_lines(f):
+            name, _, value = line.partition(':')
+            prop = name.split(';')[0].split('.')[-1].upper()
+            if prop == 'BEGIN' and value.upper() == 'VCARD':
+                record, start = {'last_name': '', 'first_name': '', 'middle_name': '', 'phones': [], 'email': None, 'dob': None}, line_no
+            elif record is None:
+                continue
+            elif prop == 'END':
+                yield start, record
+                record = None
+            elif prop == 'N':
+                parts = [_vcard_unescape(part).strip() for part in re.split(r'(?<!\\);', value)] + [''] * 3
+                record['last_name'], record['first_name'], record['middle_name'] = parts[:3]
+            elif prop == 'FN' and not (record['last_name'] or record['first_name']):
+                parts = _vcard_unescape(value).split() + [''] * 3
+                record['last_name'], record['first_name'], record['middle_name'] = parts[0], parts[1], ' '.join(parts[2:]).strip()
+            elif prop == 'TEL':
+                record['phones'].append(_vcard_unescape(value).strip())
+            elif prop == 'EMAIL' and record['email'] is None:
+                record['email'] = _vcard_unescape(value).strip() or None
+            elif prop == 'BDAY':
+                record['dob'] = _vcard_date(value.strip()) or None
+
+
+READERS = {'csv': read_csv, 'vcf': read_vcard, 'vcard': read_vcard}
+
+
+def _flush(conn, chunk, report):
+    if chunk:
+        add_contacts(conn, chunk)
+        report['imported'] += len(chunk)
+        chunk.clear()
+
+
+def import_contacts(conn, path, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Импортирует контакты из CSV или vCard файла пачками по chunk_size строк,
+    каждая пачка вставляется одной транзакцией.
+    Возвращает отчет: число импортированных строк, список отклоненных строк
+    в виде (номер строки, причина), время работы и скорость в строках в секунду.
+    """
+    fmt = (fmt or path.rsplit('.', 1)[-1]).lower()
+    if fmt not in READERS:
+        raise ValueError(f"Неизвестный формат импорта: {fmt}")
+    report = {'imported': 0, 'rejected': [], 'seconds': 0.0, 'rows_per_sec': 0.0}
+    started = time.perf_counter()
+    chunk = []
+    for line_no, record in READERS[fmt](path):
+        error = validate_contact(record['phones'], record['email'], record['dob'])
+        if error:
+            report['rejected'].append((line_no, error))
+            continue
+        chunk.append((record['last_name'], record['first_name'], record['middle_name'],
+                      record['phones'], record['email'], record['dob']))
+        if len(chunk) >= chunk_size:
+            _flush(conn, chunk, report)
+    _flush(conn, chunk, report)
+    report['seconds'] = time.perf_counter() - started
+    rows = report['imported'] + len(report['rejected'])
+    report['rows_per_sec'] = rows / report['seconds'] if report['seconds'] else 0.0
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Импорт контактов из CSV или vCard файла.")
+    parser.add_argument('db_path', help="файл базы данных")
+    parser.add_argument('path', help="файл для импорта (.csv или .vcf)")
+    parser.add_argument('--format', choices=sorted(READERS), help="формат файла, по умолчанию - по расширению")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="строк в одной транзакции")
+    args = parser.parse_args()
+
+    conn = create_database(args.db_path)
+    if conn is None:
+        return
+    report = import_contacts(conn, args.path, args.format, args.chunk_size)
+    conn.close()
+    print(f"Импортировано: {report['imported']}, отклонено: {len(report['rejected'])}, "
+          f"{report['seconds']:.2f} с, {report['rows_per_sec']:.0f} строк/с")
+    for line_no, reason in report['rejected']:
+        print(f"  строка {line_no}: {reason}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,225 @@
+"""
+Поиск и слияние дубликатов контактов.
+
+Вместо сравнения всех пар контактов используются ключи блокировки: кандидатами в дубликаты
+считаются только контакты с одинаковым фонетическим ключом фамилии и имени, у которых к тому же
+совпадает номер телефона (последние 10 цифр), email без учета регистра или дата рождения.
+Каждый ключ дает отсортированный средствами SQLite поток строк, одинаковые ключи идут подряд;
+найденные группы объединяются в кластеры через систему непересекающихся множеств.
+В одном кластере не бывает двух разных отчеств.
+"""
+import argparse
+import re
+import time
+from itertools import groupby
+
+from Phone_DB import batches, contact_title, create_database, get_contact
+
+# Упрощенная фонетика русских имен: безударные гласные, оглушение согласных, мягкий и твердый знаки
+_PHONETIC = str.maketrans({'ё': 'е', 'э': 'е', 'о': 'а', 'я': 'а', 'ы': 'и', 'й': 'и', 'ю': 'у',
+                           'б': 'п', 'в': 'ф', 'г': 'к', 'д': 'т', 'ж': 'ш', 'з': 'с', 'ъ': None, 'ь': None})
+# Номера короче не участвуют в поиске дубликатов: слишком вероятны случайные совпадения
+MIN_PHONE_DIGITS = 7
+# Сколько последних цифр номера сравнивается: 8 916 ... и +7 916 ... - один номер
+PHONE_KEY_DIGITS = 10
+
+# Ключи блокировки: запрос возвращает (ключ, id контакта, фонетический ключ отчества), упорядоченные по ключу
+BLOCKING_QUERIES = {
+    'phone': f"""
+        SELECT substr(pn.phone_reversed, 1, {PHONE_KEY_DIGITS}) || '|' || n.name_key AS block, n.id, n.middle_key
+        FROM phone_numbers pn
+        JOIN temp.dedup_names n ON n.id = pn.contact_id
+        WHERE length(pn.phone_reversed) >= {MIN_PHONE_DIGITS}
+        ORDER BY block
+    """,
+    'email': """
+        SELECT lower(trim(c.email)) || '|' || n.name_key AS block, n.id, n.middle_key
+        FROM contacts c
+        JOIN temp.dedup_names n ON n.id = c.id
+        WHERE trim(c.email) <> ''
+        ORDER BY block
+    """,
+    'dob': """
+        SELECT c.dob_iso || '|' || n.name_key AS block, n.id, n.middle_key
+        FROM contacts c
+        JOIN temp.dedup_names n ON n.id = c.id
+        WHERE c.dob_iso IS NOT NULL
+        ORDER BY block
+    """,
+}
+
+
+def phonetic_key(name):
+    """Фонетический ключ имени: регистр, ё/е, безударные гласные и звонкие/глухие согласные не различаются."""
+    if not name:
+        return ''
+    key = re.sub(r'[^a-zа-я]', '', name.lower().translate(_PHONETIC))
+    return re.sub(r'(.)\1+', r'\1', key)
+
+
+def _compatible_groups(members):
+    """
+    Делит контакты одного блока (id, ключ отчества) на группы дубликатов по отчеству.
+    Контакты без отчества присоединяются к группе, только если отчество в блоке одно - иначе неясно, к какой.
+    """
+    by_middle = {}
+    for contact_id, middle_key in members:
+        by_middle.setdefault(middle_key, []).append(contact_id)
+    without_middle = by_middle.pop('', [])
+    if len(by_middle) > 1:
+        return list(by_middle.values())
+    return [without_middle + ids for ids in by_middle.values()] or [without_middle]
+
+
+def find_duplicates(conn):
+    """
+    Находит кластеры дубликатов. Возвращает отчет: кластеры (списки id по возрастанию,
+    упорядоченные по первому id), число найденных групп по каждому ключу блокировки и время работы.
+    """
+    started = time.perf_counter()
+    conn.create_function('phonetic_key', 1, phonetic_key, deterministic=True)
+    cursor = conn.cursor()
+    # Фонетические ключи считаются один раз на контакт, а не в каждом запросе блокировки
+    cursor.execute("DROP TABLE IF EXISTS temp.dedup_names")
+    cursor.execute("""
+        CREATE TEMP TABLE dedup_names AS
+        SELECT id, phonetic_key(last_name) || '|' || phonetic_key(first_name) AS name_key, phonetic_key(middle_name) AS middle_key
+        FROM contacts
+    """)
+
+    parent, middle_keys, cluster_middles = {}, {}, {}
+
+    def find(contact_id):
+        root = parent.setdefault(contact_id, contact_id)
+        while root != parent[root]:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    def middles(root):
+        return cluster_middles.get(root, {middle_keys[root]} - {''})
+
+    def union(contact_id, other_id):
+        # Отчество сверяется со всем кластером, а не только с блоком: иначе контакт без отчества,
+        # попавший в блоки к двум разным отчествам, связал бы их в один кластер
+        root, other = find(contact_id), find(other_id)
+        if root == other:
+            return
+        combined = middles(root) | middles(other)
+        if len(combined) > 1:
+            return
+        parent[other] = root
+        cluster_middles[root] = combined
+        cluster_middles.pop(other, None)
+
+    report = {'clusters': [], 'blocks': {}, 'seconds': 0.0}
+    try:
+        for name, query in BLOCKING_QUERIES.items():
+            report['blocks'][name] = 0
+            for _, rows in groupby(cursor.execute(query), key=lambda row: row[0]):
+                rows = list(rows)
+                if len(rows) < 2:
+                    continue
+                middle_keys.update((row[1], row[2]) for row in rows)
+                for ids in _compatible_groups({(row[1], row[2]) for row in rows}):
+                    if len(ids) < 2:
+                        continue
+                    report['blocks'][name] += 1
+                    for contact_id in ids[1:]:
+                        union(ids[0], contact_id)
+    finally:
+        cursor.execute("DROP TABLE IF EXISTS temp.dedup_names")
+
+    clusters = {}
+    for contact_id in parent:
+        clusters.setdefault(find(contact_id), []).append(contact_id)
+    report['clusters'] = sorted(sorted(ids) for ids in clusters.values() if len(ids) > 1)
+    report['seconds'] = time.perf_counter() - started
+    return report
+
+
+def merge_duplicates(conn, clusters, cache=None):
+    """
+    Сливает каждый кластер в контакт с наименьшим id одной транзакцией: пустые поля (отчество, email,
+    дата рождения) заполняются из остальных контактов кластера, их номера переносятся без повторов
+    (номера с одинаковыми последними PHONE_KEY_DIGITS цифрами считаются одним),
+    а сами контакты удаляются. Возвращает число удаленных контактов.
+    """
+    clusters = [sorted(ids) for ids in clusters if len(ids) > 1]
+    if not clusters:
+        return 0
+    cursor = conn.cursor()
+    with conn:
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        contacts, phones = {}, {}
+        for batch in batches(contact_id for ids in clusters for contact_id in ids):
+            placeholders = ', '.join('?' * len(batch))
+            cursor.execute(f"SELECT id, middle_name, email, dob FROM contacts WHERE id IN ({placeholders})", batch)
+            contacts.update((row[0], row[1:]) for row in cursor.fetchall())
+            cursor.execute(f"""
+                SELECT contact_id, phone_number, phone_normalized, phone_reversed FROM phone_numbers
+                WHERE contact_id IN ({placeholders}) ORDER BY id
+            """, batch)
+            for contact_id, *phone in cursor.fetchall():
+                phones.setdefault(contact_id, []).append(phone)
+
+        updates, moved_phones, removed = [], [], []
+        for survivor, *others in clusters:
+            others = [contact_id for contact_id in others if contact_id in contacts]
+            if survivor not in contacts or not others:
+                continue
+            # Для каждого поля - первое непустое значение по возрастанию id
+            fields = [next((contacts[contact_id][i] for contact_id in (survivor, *others) if contacts[contact_id][i]), contacts[survivor][i])
+                      for i in range(3)]
+            if fields != list(contacts[survivor]):
+                updates.append((*fields, survivor))
+            # Номер переносится, только если его последних PHONE_KEY_DIGITS цифр у контакта еще нет -
+            # так же номера сравниваются при поиске дубликатов
+            known = {phone_reversed[:PHONE_KEY_DIGITS] for _, _, phone_reversed in phones.get(survivor, ())}
+            for contact_id in others:
+                for phone_number, phone_normalized, phone_reversed in phones.get(contact_id, ()):
+                    if phone_reversed[:PHONE_KEY_DIGITS] not in known:
+                        known.add(phone_reversed[:PHONE_KEY_DIGITS])
+                        moved_phones.append((survivor, phone_number, phone_normalized, phone_reversed))
+            removed.extend((contact_id,) for contact_id in others)
+
+        cursor.executemany("UPDATE contacts SET middle_name = ?, email = ?, dob = ? WHERE id = ?", updates)
+        cursor.executemany("INSERT OR IGNORE INTO phone_numbers (contact_id, phone_number, phone_normalized, phone_reversed) VALUES (?, ?, ?, ?)", moved_phones)
+        # Номера удаляемых контактов удаляются каскадно
+        cursor.executemany("DELETE FROM contacts WHERE id = ?", removed)
+
+    if cache is not None:
+        for ids in clusters:
+            for contact_id in ids:
+                cache.discard(contact_id)
+    return len(removed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Поиск и слияние дубликатов контактов.")
+    parser.add_argument('db_path', help="файл базы данных")
+    parser.add_argument('--merge', action='store_true', help="слить найденные дубликаты (без него - только отчет)")
+    parser.add_argument('--show', type=int, default=20, help="сколько кластеров вывести")
+    args = parser.parse_args()
+
+    conn = create_database(args.db_path)
+    if conn is None:
+        return
+    report = find_duplicates(conn)
+    clusters = report['clusters']
+    blocks = ', '.join(f"{name}: {count}" for name, count in report['blocks'].items())
+    print(f"Кластеров дубликатов: {len(clusters)}, контактов в них: {sum(map(len, clusters))} "
+          f"(групп по ключам - {blocks}), {report['seconds']:.2f} с")
+    for ids in clusters[:args.show]:
+        print(' / '.join(f"{contact_id}: {contact_title(contact)}"
+                         for contact_id, contact in ((contact_id, get_contact(conn, contact_id)) for contact_id in ids)))
+    if args.merge:
+        started = time.perf_counter()
+        removed = merge_duplicates(conn, clusters)
+        print(f"Слито: удалено {removed} контактов, {time.perf_counter() - started:.2f} с")
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""
+One-hot кодирование категориальных столбцов DataFrame без построчных вычислений на Python.
+
+Скрипты "One-hot (alternative)" и "One-hot (pd.series)" перебирают значения в цикле для каждой
+строки и каждой категории. Здесь значения переводятся в коды pd.Categorical, а единицы
+расставляются одной векторной операцией NumPy:
+
+    encoder = OneHotEncoder(['whoAmI']).fit(train)
+    encoded = encoder.transform(data)       # только новые столбцы
+    data = one_hot(data, ['whoAmI'])        # исходный DataFrame с присоединенными столбцами
+
+Для файлов больше памяти и столбцов с десятками тысяч категорий encode_csv читает CSV частями
+и сохраняет каждую часть разреженной матрицей CSR (нужен SciPy):
+
+    report = encode_csv('data.csv', 'encoded', ['city'])
+    matrix, names = load_encoded('encoded')
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Что делать со значениями, которых не было при fit: 'ignore' - нулевая строка, 'error' - ValueError
+HANDLE_UNKNOWN = ('ignore', 'error')
+
+
+def _sorted_categories(values):
+    """Сортирует категории; значения разных типов, которые нельзя сравнить, сортируются как строки."""
+    try:
+        return sorted(values)
+    except TypeError:
+        return sorted(values, key=str)
+
+
+class OneHotEncoder:
+    """
+    Кодировщик с запоминаемым словарем категорий.
+
+    fit запоминает для каждого столбца отсортированный список категорий, поэтому набор и порядок
+    выходных столбцов не зависят от порядка строк и одинаковы для любых данных после fit.
+    Выходные столбцы называются "<столбец><prefix_sep><категория>"; при prefix_sep=None -
+    просто по категории, как в исходных скриптах. Пропуски (NaN/None) кодируются нулевой строкой.
+    """
+
+    def __init__(self, columns=None, dtype='uint8', handle_unknown='ignore', prefix_sep='_'):
+        if handle_unknown not in HANDLE_UNKNOWN:
+            raise ValueError(f"handle_unknown должен быть одним из {HANDLE_UNKNOWN}, а не {handle_unknown!r}")
+        self.columns = list(columns) if columns is not None else None
+        self.dtype = np.dtype(dtype)
+        self.handle_unknown = handle_unknown
+        self.prefix_sep = prefix_sep
+        self.categories_ = {}
+
+    def _columns(self, data):
+        if self.columns is not None:
+            return self.columns
+        return [column for column in data.columns if data[column].dtype == object or isinstance(data[column].dtype, (pd.CategoricalDtype, pd.StringDtype))]
+
+    def partial_fit(self, data):
+        """Дополняет словарь категориями из data (например, очередной части большого файла)."""
+        if self.columns is None:
+            self.columns = self._columns(data)
+        for column in self.columns:
+            known = set(self.categories_.get(column, ()))
+            known.update(data[column].dropna().unique().tolist())
+            self.categories_[column] = _sorted_categories(known)
+        return self
+
+    def fit(self, data):
+        """Строит словарь категорий по data заново."""
+        self.categories_ = {}
+        return self.partial_fit(data)
+
+    def get_feature_names(self):
+        """Имена выходных столбцов в порядке их следования."""
+        if self.prefix_sep is None:
+            return [category for column in self.columns for category in self.categories_[column]]
+        return [f"{column}{self.prefix_sep}{category}" for column in self.columns for category in self.categories_[column]]
+
+    def codes(self, data):
+        """
+        Возвращает для каждого столбца массив номеров категорий (-1 - пропуск или неизвестное значение)
+        и смещение его первого выходного столбца.
+        """
+        if not self.categories_:
+            raise ValueError("Кодировщик не обучен: сначала вызовите fit")
+        result, offset = [], 0
+        for column in self.columns:
+            categories = self.categories_[column]
+            codes = pd.Categorical(data[column], categories=categories).codes
+            if self.handle_unknown == 'error':
+                unknown = (codes < 0) & data[column].notna().to_numpy()
+                if unknown.any():
+                    examples = pd.unique(data[column].to_numpy()[unknown])[:5].tolist()
+                    raise ValueError(f"Неизвестные категории в столбце {column!r}: {examples}")
+            result.append((codes, offset))
+            offset += len(categories)
+        return result
+
+    def transform(self, data):
+        """Кодирует столбцы data; возвращает DataFrame из одних выходных столбцов с индексом data."""
+        names = self.get_feature_names()
+        matrix = np.zeros((len(data), len(names)), dtype=self.dtype)
+        for codes, offset in self.codes(data):
+            rows = np.flatnonzero(codes >= 0)
+            # Коды pd.Categorical бывают int8/int16: приводим до сложения со смещением, чтобы не было переполнения
+            matrix[rows, offset + codes[rows].astype(np.intp)] = 1
+        return pd.DataFrame(matrix, index=data.index, columns=names)
+
+    def transform_sparse(self, data):
+        """Кодирует столбцы data в разреженную матрицу scipy.sparse.csr_matrix без плотного промежуточного массива."""
+        from scipy import sparse
+
+        rows, cols = [], []
+        for codes, offset in self.codes(data):
+            present = np.flatnonzero(codes >= 0)
+            rows.append(present)
+            cols.append(offset + codes[present].astype(np.intp))
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        return sparse.csr_matrix((np.ones(len(rows), dtype=self.dtype), (rows, cols)),
+                                 shape=(len(data), len(self.get_feature_names())))
+
+    def fit_transform(self, data):
+        return self.fit(data).transform(data)
+
+
+def one_hot(data, columns=None, **options):
+    """Возвращает data с присоединенными one-hot столбцами, как исходные скрипты; options - параметры OneHotEncoder."""
+    return pd.concat([data, OneHotEncoder(columns, **options).fit_transform(data)], axis=1)
+
+
+# Число строк CSV в одной части при потоковом кодировании
+DEFAULT_CHUNK_SIZE = 100_000
+VOCABULARY_FILE = 'vocabulary.json'
+
+
+def _read_chunks(path, columns, chunksize):
+    # Кодируемые столбцы читаются как строки, иначе тип (а с ним и категории) мог бы отличаться в разных частях
+    return pd.read_csv(path, usecols=columns, dtype={column: str for column in columns}, chunksize=chunksize)
+
+
+def fit_csv(path, columns, chunksize=DEFAULT_CHUNK_SIZE, **options):
+    """Первый проход по CSV: строит словарь категорий, держа в памяти одну часть файла и сами категории."""
+    encoder = OneHotEncoder(columns, **options)
+    for chunk in _read_chunks(path, columns, chunksize):
+        encoder.partial_fit(chunk)
+    return encoder
+
+
+def encode_csv(path, out_dir, columns, chunksize=DEFAULT_CHUNK_SIZE, **options):
+    """
+    Кодирует столбцы columns CSV-файла в два прохода: словарь категорий, затем по частям из chunksize строк,
+    каждая из которых сохраняется в out_dir как part-NNNNN.npz (CSR). Словарь, имена столбцов и список
+    частей записываются в vocabulary.json. Память ограничена размером части, а не числом строк и категорий.
+    Возвращает отчет: число строк, частей, выходных столбцов, ненулевых элементов и время работы.
+    """
+    from scipy import sparse
+
+    started = time.perf_counter()
+    encoder = fit_csv(path, columns, chunksize, **options)
+    os.makedirs(out_dir, exist_ok=True)
+    report = {'rows': 0, 'parts': [], 'features': len(encoder.get_feature_names()), 'nnz': 0, 'seconds': 0.0}
+    for number, chunk in enumerate(_read_chunks(path, columns, chunksize)):
+        matrix = encoder.transform_sparse(chunk)
+        part = f"part-{number:05d}.npz"
+        sparse.save_npz(os.path.join(out_dir, part), matrix)
+        report['rows'] += matrix.shape[0]
+        report['nnz'] += matrix.nnz
+        report['parts'].append(part)
+    with open(os.path.join(out_dir, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'columns': encoder.columns, 'categories': encoder.categories_, 'feature_names': encoder.get_feature_names(),
+                   'dtype': encoder.dtype.name, 'rows': report['rows'], 'parts': report['parts']}, f, ensure_ascii=False)
+    report['seconds'] = time.perf_counter() - started
+    return report
+
+
+def iter_encoded(out_dir):
+    """Перебирает сохраненные encode_csv части по порядку как матрицы CSR."""
+    from scipy import sparse
+
+    with open(os.path.join(out_dir, VOCABULARY_FILE), encoding='utf-8') as f:
+        vocabulary = json.load(f)
+    for part in vocabulary['parts']:
+        yield sparse.load_npz(os.path.join(out_dir, part)).tocsr()
+
+
+def load_encoded(out_dir, as_frame=False):
+    """
+    Собирает все части encode_csv в одну матрицу CSR и возвращает ее с именами столбцов.
+    При as_frame=True возвращает разреженный DataFrame (pd.arrays.SparseArray в столбцах).
+    """
+    from scipy import sparse
+
+    with open(os.path.join(out_dir, VOCABULARY_FILE), encoding='utf-8') as f:
+        vocabulary = json.load(f)
+    names = vocabulary['feature_names']
+    parts = list(iter_encoded(out_dir))
+    matrix = sparse.vstack(parts, format='csr') if parts else sparse.csr_matrix((0, len(names)), dtype=vocabulary['dtype'])
+    if as_frame:
+        return pd.DataFrame.sparse.from_spmatrix(matrix, columns=names)
+    return matrix, names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Потоковое one-hot кодирование CSV в разреженные матрицы.")
+    parser.add_argument('path', help="CSV-файл")
+    parser.add_argument('out_dir', help="каталог для частей и словаря")
+    parser.add_argument('columns', nargs='+', help="кодируемые столбцы")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_SIZE, help="строк в одной части")
+    parser.add_argument('--dtype', default='uint8', choices=('uint8', 'bool'))
+    parser.add_argument('--handle-unknown', default='ignore', choices=HANDLE_UNKNOWN)
+    args = parser.parse_args()
+
+    report = encode_csv(args.path, args.out_dir, args.columns, args.chunksize,
+                        dtype=args.dtype, handle_unknown=args.handle_unknown)
+    print(f"Строк: {report['rows']}, частей: {len(report['parts'])}, столбцов: {report['features']}, "
+          f"ненулевых: {report['nnz']}, {report['seconds']:.2f} с")
+
+
+if __name__ == '__main__':
+    main()
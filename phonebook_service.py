@@ -0,0 +1,276 @@
+"""
+HTTP/JSON-сервис телефонного справочника на asyncio.
+
+    GET    /contacts?q=...&limit=N   поиск (search_contacts)
+    GET    /contacts/<id>            контакт по id
+    POST   /contacts                 добавление контакта (201); как в save_contact, при совпадении ФИО
+                                     номера добавляются к существующему контакту (200)
+    PATCH  /contacts/<id>            изменение полей контакта
+    DELETE /contacts/<id>            удаление контакта
+
+Работа с SQLite выполняется в ограниченном пуле потоков через ConnectionManager.
+Одновременные запросы на запись собираются в пачки и применяются общими транзакциями;
+подряд идущие запросы одного вида применяются вместе, порядок запросов сохраняется.
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from urllib.parse import parse_qs, urlsplit
+
+from Phone_DB import (CONTACT_NOT_FOUND, delete_contacts, edit_contacts, existing_contact_ids, get_contact, save_contacts,
+                      search_contacts, validate_changes)
+from connection_manager import ConnectionManager
+
+REASONS = {200: 'OK', 201: 'Created', 204: 'No Content', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 413: 'Payload Too Large', 500: 'Internal Server Error'}
+MAX_BODY_SIZE = 1024 * 1024
+DEFAULT_SEARCH_LIMIT = 50
+
+
+class PhonebookService:
+    """
+    Сервис справочника поверх файла базы данных db_path.
+
+    workers - размер пула потоков для работы с SQLite (и число соединений для чтения),
+    max_batch - наибольшее число запросов на запись в одной транзакции,
+    batch_window - сколько секунд ждать накопления пачки после первого запроса на запись.
+    Метод handle(method, target, body) обрабатывает запрос без сети и удобен для проверок.
+    """
+
+    def __init__(self, db_path, workers=4, max_batch=500, batch_window=0.002):
+        self.manager = ConnectionManager(db_path, readers=workers)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='phonebook')
+        # Не даем очереди пула потоков расти без ограничений
+        self._slots = asyncio.Semaphore(workers * 4)
+        self._writes = asyncio.Queue()
+        self._batcher = None
+
+    async def _offload(self, func, *args):
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _submit_write(self, kind, payload):
+        if self._batcher is None:
+            self._batcher = asyncio.create_task(self._run_batcher())
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((kind, payload, future))
+        return await future
+
+    async def _run_batcher(self):
+        """Собирает накопившиеся запросы на запись и применяет их пачкой."""
+        while True:
+            batch = [await self._writes.get()]
+            if self.batch_window:
+                await asyncio.sleep(self.batch_window)
+            while len(batch) < self.max_batch and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            try:
+                results = await self._offload(self._apply_writes, [(kind, payload) for kind, payload, _ in batch])
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, _, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    def _apply_writes(self, batch):
+        """
+        Применяет пачку записей по порядку: подряд идущие запросы одного вида (добавления, изменения
+        или удаления) образуют группу, и каждая группа применяется своей транзакцией. Поэтому
+        DELETE и следующий за ним PATCH того же контакта не меняются местами. Ошибка откатывает
+        только транзакцию своей группы и дает код 500 только ее запросам: ответы на уже
+        закрепленные записи других групп не меняются.
+        Возвращает пары (код ответа, тело) по порядку запросов.
+        """
+        results = []
+        with self.manager.writer() as conn:
+            for kind, requests in groupby(batch, key=lambda request: request[0]):
+                payloads = [payload for _, payload in requests]
+                try:
+                    results.extend(WRITE_HANDLERS[kind](conn, payloads))
+                except Exception as e:
+                    results.extend([(500, {'error': str(e)})] * len(payloads))
+        return results
+
+    async def handle(self, method, target, body=b''):
+        """Обрабатывает один запрос. Возвращает пару (код ответа, тело для JSON или None)."""
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        if not parts or parts[0] != 'contacts' or len(parts) > 2:
+            return 404, {'error': "Неизвестный адрес."}
+        try:
+            contact_id = int(parts[1]) if len(parts) == 2 else None
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {'error': "Некорректный запрос."}
+
+        if contact_id is None and method == 'GET':
+            query = parse_qs(url.query)
+            if not query.get('q'):
+                return 400, {'error': "Не указан параметр q."}
+            try:
+                limit = int(query.get('limit', [DEFAULT_SEARCH_LIMIT])[0])
+            except ValueError:
+                return 400, {'error': "Некорректный параметр limit."}
+            return 200, await self._offload(self.manager.read, search_contacts, query['q'][0], limit)
+        if contact_id is None and method == 'POST':
+            contact, error = _contact_payload(payload)
+            if error:
+                return 400, {'error': error}
+            return await self._submit_write('add', contact)
+        if contact_id is not None and method == 'GET':
+            contact = await self._offload(self.manager.read, get_contact, contact_id)
+            return (200, contact) if contact is not None else (404, {'error': CONTACT_NOT_FOUND})
+        if contact_id is not None and method == 'PATCH':
+            if not isinstance(payload, dict):
+                return 400, {'error': "Некорректные данные контакта."}
+            error = validate_changes(payload)
+            if error:
+                return 400, {'error': error}
+            return await self._submit_write('edit', (contact_id, payload))
+        if contact_id is not None and method == 'DELETE':
+            return await self._submit_write('delete', (contact_id, None))
+        return 405, {'error': "Метод не поддерживается."}
+
+    async def _serve_connection(self, reader, writer):
+        """Обслуживает одно HTTP/1.1 соединение, поддерживая keep-alive."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_SIZE:
+                    status, result = 413, {'error': "Слишком большой запрос."}
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    try:
+                        status, result = await self.handle(method, target, body)
+                    except Exception as e:
+                        status, result = 500, {'error': str(e)}
+                data = b'' if result is None else json.dumps(result, ensure_ascii=False).encode('utf-8')
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive or status == 413:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """Запускает HTTP-сервер и возвращает объект asyncio.Server."""
+        return await asyncio.start_server(self._serve_connection, host, port)
+
+    def close(self):
+        """Останавливает обработку записей и закрывает пул потоков и соединения."""
+        if self._batcher is not None:
+            self._batcher.cancel()
+        self._executor.shutdown(wait=True)
+        self.manager.close()
+
+
+def _apply_adds(conn, contacts):
+    """
+    Сохраняет контакты, уже проверенные в handle, через save_contacts. Возвращает ответы по порядку:
+    201 для нового контакта, 200 - если номера добавлены к контакту с теми же ФИО.
+    """
+    saved = save_contacts(conn, [(contact['last_name'], contact['first_name'], contact['middle_name'],
+                                  contact['phones'], contact['email'], contact['dob']) for contact in contacts])
+    return [(201 if created else 200, {'id': contact_id}) for contact_id, created in saved]
+
+
+def _apply_edits(conn, edits):
+    """Применяет изменения (id, поля); изменения одного контакта объединяются по порядку запросов."""
+    changes = {}
+    for contact_id, fields in edits:
+        changes.setdefault(contact_id, {}).update(fields)
+    # Отсутствующие контакты edit_contacts сам возвращает среди отклоненных с причиной CONTACT_NOT_FOUND
+    rejected = dict(edit_contacts(conn, changes)['rejected'])
+    responses = []
+    for contact_id, _ in edits:
+        reason = rejected.get(contact_id)
+        if reason is None:
+            responses.append((200, {'id': contact_id}))
+        else:
+            responses.append((404 if reason == CONTACT_NOT_FOUND else 400, {'error': reason}))
+    return responses
+
+
+def _apply_deletes(conn, deletes):
+    """Удаляет контакты по id; для отсутствующих и для повторного удаления того же id - ответ 404."""
+    contact_ids = [contact_id for contact_id, _ in deletes]
+    existing = existing_contact_ids(conn, contact_ids)
+    delete_contacts(conn, existing)
+    responses = []
+    for contact_id in contact_ids:
+        if contact_id in existing:
+            existing.discard(contact_id)
+            responses.append((204, None))
+        else:
+            responses.append((404, {'error': CONTACT_NOT_FOUND}))
+    return responses
+
+
+# Обработчики групп запросов на запись по их виду
+WRITE_HANDLERS = {'add': _apply_adds, 'edit': _apply_edits, 'delete': _apply_deletes}
+
+
+def _contact_payload(payload):
+    """
+    Проверяет тело запроса на добавление контакта и дополняет отсутствующие поля.
+    Возвращает пару (контакт, текст ошибки); при ошибке контакт - None.
+    """
+    if not isinstance(payload, dict):
+        return None, "Некорректные данные контакта."
+    contact = {'last_name': '', 'first_name': '', 'middle_name': '', 'phones': [], 'email': None, 'dob': None, **payload}
+    error = validate_changes(contact)
+    return (None, error) if error else (contact, None)
+
+
+async def serve(db_path, host, port, workers):
+    service = PhonebookService(db_path, workers=workers)
+    server = await service.start(host, port)
+    print(f"Справочник доступен на http://{host}:{port}/contacts")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON-сервис телефонного справочника.")
+    parser.add_argument('db_path', help="файл базы данных")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=4, help="потоков для работы с SQLite")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.db_path, args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Профилирование запросов к SQLite: счетчики и гистограммы задержек по запросам,
+журнал медленных запросов с их планами выполнения (EXPLAIN QUERY PLAN).
+
+Профилирование включается при открытии базы через фабрику соединений:
+
+    profiler = QueryProfiler(slow_threshold_ms=50)
+    conn = create_database(db_path, factory=profiler.connection_class)
+    ...
+    print(profiler.summary())
+"""
+import bisect
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Верхние границы корзин гистограммы задержек, мс; последняя корзина - все, что медленнее
+HISTOGRAM_BOUNDS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+
+
+def normalize_sql(sql):
+    """Приводит текст запроса к виду для группировки: литералы заменяются на ?, пробелы схлопываются."""
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    return ' '.join(sql.split())
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """
+    Курсор, замеряющий время execute, executemany и executescript.
+    Вызов executemany учитывается как один запрос со временем всей пачки; для SELECT замеряется
+    время до первой строки результата, без последующих fetch.
+    """
+
+    def _timed(self, method, sql, params, first_params):
+        profiler = self.connection.profiler
+        started = time.perf_counter()
+        try:
+            result = method(sql, params) if params is not None else method(sql)
+        except sqlite3.Error:
+            profiler.record(self.connection, sql, first_params, time.perf_counter() - started, failed=True)
+            raise
+        profiler.record(self.connection, sql, first_params, time.perf_counter() - started)
+        return result
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        seq_of_parameters = list(seq_of_parameters)
+        return self._timed(super().executemany, sql, seq_of_parameters, seq_of_parameters[0] if seq_of_parameters else None)
+
+    def executescript(self, sql_script):
+        return self._timed(super().executescript, sql_script, None, None)
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Соединение, выдающее ProfiledCursor и передающее выполненные SQLite операторы в профилировщик."""
+
+    profiler = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.set_trace_callback(self.profiler.trace)
+
+    def cursor(self, factory=None):
+        return super().cursor(factory or ProfiledCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+
+class QueryProfiler:
+    """
+    Собирает статистику запросов соединений, созданных с factory=profiler.connection_class.
+
+    По каждому запросу (текст с параметрами ?) считает число вызовов, ошибки, суммарное
+    и наибольшее время и гистограмму задержек. Запросы медленнее slow_threshold_ms попадают
+    в журнал медленных запросов (не более max_slow_queries последних) вместе с планом выполнения.
+    Отдельно через set_trace_callback считаются все операторы, которые выполнил SQLite,
+    включая операторы триггеров и неявные BEGIN/COMMIT.
+    """
+
+    def __init__(self, slow_threshold_ms=100.0, explain=True, max_slow_queries=1000):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.explain = explain
+        self.max_slow_queries = max_slow_queries
+        self.connection_class = type('ProfiledConnection', (ProfiledConnection,), {'profiler': self})
+        self._lock = threading.Lock()
+        self._explaining = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает собранную статистику."""
+        with self._lock:
+            self.statements = {}
+            self.traced = {}
+            self.slow_queries = []
+
+    def trace(self, statement):
+        """Обработчик set_trace_callback: считает операторы, фактически выполненные SQLite."""
+        if getattr(self._explaining, 'active', False):
+            return
+        key = normalize_sql(statement)
+        with self._lock:
+            self.traced[key] = self.traced.get(key, 0) + 1
+
+    def record(self, conn, sql, params, seconds, failed=False):
+        """Учитывает один вызов запроса sql длительностью seconds."""
+        elapsed_ms = seconds * 1000
+        key = ' '.join(sql.split())
+        with self._lock:
+            stats = self.statements.get(key)
+            if stats is None:
+                stats = self.statements[key] = {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                                                'histogram': [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)}
+            stats['count'] += 1
+            stats['errors'] += failed
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['histogram'][bisect.bisect_left(HISTOGRAM_BOUNDS_MS, elapsed_ms)] += 1
+        if elapsed_ms < self.slow_threshold_ms:
+            return
+        entry = {'sql': key, 'ms': elapsed_ms, 'params': repr(params), 'plan': None,
+                 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        if self.explain and not failed and key.lstrip('( ').upper().startswith(_EXPLAINABLE):
+            entry['plan'] = self._explain(conn, sql, params)
+        logger.warning("Медленный запрос (%.1f мс): %s%s", elapsed_ms, key,
+                       ''.join(f"\n    {line}" for line in entry['plan'] or ()))
+        with self._lock:
+            self.slow_queries.append(entry)
+            del self.slow_queries[:-self.max_slow_queries]
+
+    def _explain(self, conn, sql, params):
+        """Возвращает план выполнения запроса строками EXPLAIN QUERY PLAN."""
+        self._explaining.active = True
+        try:
+            cursor = conn.cursor(sqlite3.Cursor)
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params if params is not None else ())
+            return [detail for _, _, _, detail in cursor.fetchall()]
+        except sqlite3.Error as e:
+            return [f"EXPLAIN QUERY PLAN не выполнен: {e}"]
+        finally:
+            self._explaining.active = False
+
+    def report(self):
+        """Возвращает собранную статистику словарем, пригодным для JSON."""
+        with self._lock:
+            return {
+                'slow_threshold_ms': self.slow_threshold_ms,
+                'histogram_bounds_ms': list(HISTOGRAM_BOUNDS_MS),
+                'statements': {sql: {**stats, 'avg_ms': stats['total_ms'] / stats['count'], 'histogram': list(stats['histogram'])}
+                               for sql, stats in self.statements.items()},
+                'traced': dict(self.traced),
+                'slow_queries': list(self.slow_queries),
+            }
+
+    def summary(self, top=20):
+        """Текстовая сводка: самые затратные по суммарному времени запросы и последние медленные запросы."""
+        report = self.report()
+        lines = [f"{'вызовов':>8} {'ошибок':>7} {'всего, мс':>11} {'сред., мс':>10} {'макс., мс':>10}  запрос"]
+        by_total = sorted(report['statements'].items(), key=lambda item: item[1]['total_ms'], reverse=True)
+        for sql, stats in by_total[:top]:
+            lines.append(f"{stats['count']:>8} {stats['errors']:>7} {stats['total_ms']:>11.2f} {stats['avg_ms']:>10.3f} "
+                         f"{stats['max_ms']:>10.3f}  {sql[:120]}")
+        if report['slow_queries']:
+            lines.append(f"\nМедленные запросы (>= {self.slow_threshold_ms} мс):")
+            for entry in report['slow_queries'][-top:]:
+                lines.append(f"{entry['ms']:>10.2f} мс  {entry['sql'][:120]}")
+                lines.extend(f"              {line}" for line in entry['plan'] or ())
+        return '\n'.join(lines)
+
+    def dump(self, path):
+        """Сохраняет собранную статистику в JSON-файл."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,27 @@
+"""Проверки поиска и слияния дубликатов."""
+import Phone_DB
+import dedup
+
+
+def test_merge_keeps_one_copy_of_number_in_different_formats():
+    conn = Phone_DB.create_database(':memory:')
+    Phone_DB.add_contacts(conn, [('Иванов', 'Иван', 'Петрович', ['+7 900 123 45 67'], None, None),
+                                 ('ИВАНОВ', 'иван', '', ['8 (900) 123-45-67', '555-12-34'], 'ivanov@mail.ru', None)])
+    clusters = dedup.find_duplicates(conn)['clusters']
+    assert clusters == [[1, 2]]
+    assert dedup.merge_duplicates(conn, clusters) == 1
+    contact = Phone_DB.get_contact(conn, 1)
+    assert contact['phones'] == ['+7 900 123 45 67', '555-12-34']
+    assert contact['email'] == 'ivanov@mail.ru'
+
+
+def test_contact_without_patronymic_does_not_chain_two_people():
+    conn = Phone_DB.create_database(':memory:')
+    Phone_DB.add_contacts(conn, [('Иванов', 'Иван', 'Петрович', ['+7 900 111 22 33'], None, None),
+                                 ('Иванов', 'Иван', '', ['8 900 111 22 33'], 'ivan@x.ru', None),
+                                 ('Иванов', 'Иван', 'Сергеевич', ['555-12-34'], 'ivan@x.ru', None)])
+    clusters = dedup.find_duplicates(conn)['clusters']
+    assert clusters == [[1, 2]]
+    assert dedup.merge_duplicates(conn, clusters) == 1
+    assert Phone_DB.get_contact(conn, 3)['phones'] == ['555-12-34']
+    assert Phone_DB.get_contact(conn, 1)['phones'] == ['+7 900 111 22 33']
@@ -0,0 +1,16 @@
+"""Проверки OneHotEncoder (нужны pandas и NumPy)."""
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from one_hot import OneHotEncoder
+
+
+def test_column_after_many_categories():
+    # Коды столбца с малым числом категорий имеют тип int8; смещение после 200 категорий в него не помещается
+    data = pd.DataFrame({'a': [f"x{i}" for i in range(200)], 'b': ['p', 'q'] * 100})
+    encoded = OneHotEncoder(['a', 'b']).fit_transform(data)
+    assert encoded.shape == (200, 202)
+    assert (encoded.sum(axis=1) == 2).all()
+    assert encoded['b_p'].tolist() == [1, 0] * 100
+    assert encoded['a_x150'].sum() == 1
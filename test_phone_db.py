@@ -0,0 +1,37 @@
+"""Проверки функций Phone_DB на базе в памяти."""
+from datetime import date
+
+import Phone_DB
+
+
+def test_pages_keep_contacts_with_null_names():
+    # Семь одинаковых ФИО с NULL в отчестве: граница страницы из трех попадает внутрь группы
+    conn = Phone_DB.create_database(':memory:')
+    conn.executemany("INSERT INTO contacts (last_name, first_name, middle_name) VALUES ('A', 'B', NULL)", [()] * 7)
+    conn.execute("INSERT INTO contacts (last_name, first_name, middle_name) VALUES ('C', NULL, NULL)")
+    conn.commit()
+    contacts = list(Phone_DB.iter_contacts(conn, page_size=3))
+    assert [contact['id'] for contact in contacts] == list(range(1, 9))
+    assert Phone_DB.edit_contacts(conn, {1: {'middle_name': None}})['updated'] == 0
+    conn.execute("UPDATE contacts SET middle_name = NULL WHERE id = 2")
+    assert len(Phone_DB.load_contacts(conn)) == 8
+
+
+def test_upcoming_birthdays_for_whole_year_start_from_today():
+    conn = Phone_DB.create_database(':memory:')
+    Phone_DB.add_contacts(conn, [('A', str(i), '', ['1'], None, dob) for i, dob in
+                                 enumerate(['05.01.1990', '29.02.1992', '01.03.1980', '10.06.1985', '31.12.2000'])])
+    birthdays = [contact['dob'] for contact in Phone_DB.upcoming_birthdays(conn, 365, today=date(2027, 3, 1))]
+    assert birthdays == ['01.03.1980', '10.06.1985', '31.12.2000', '05.01.1990', '29.02.1992']
+    limited = Phone_DB.upcoming_birthdays(conn, 400, today=date(2026, 6, 1), limit=2)
+    assert [contact['dob'] for contact in limited] == ['10.06.1985', '31.12.2000']
+
+
+def test_bulk_added_contacts_are_found_by_phone():
+    conn = Phone_DB.create_database(':memory:')
+    Phone_DB.add_contacts(conn, [('Иванов', 'Иван', '', ['+7 900 111 22 33', '555-12-34'], None, None)])
+    assert [contact['phones'] for contact in Phone_DB.search_contacts(conn, '555-12')] == [['+7 900 111 22 33', '555-12-34']]
+    # Построчные триггеры восстановлены: номер, добавленный позже, тоже попадает в индекс
+    Phone_DB.edit_contacts(conn, {1: {'phones': ['+7 900 111 22 33', '777-00-11']}})
+    assert [contact['id'] for contact in Phone_DB.search_contacts(conn, '777-00')] == [1]
+    assert Phone_DB.search_contacts(conn, '555-12') == []